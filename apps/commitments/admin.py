@@ -1,7 +1,14 @@
 from django.contrib import admin
+from apps.tasks.models import Task
 from .models import Commitment, Complaint, EvidenceVerification
 
 
+def _is_changelist(request):
+    """True for changelist requests, where only list_display columns are shown."""
+    match = request.resolver_match
+    return match is not None and match.url_name.endswith('_changelist')
+
+
 @admin.register(Commitment)
 class CommitmentAdmin(admin.ModelAdmin):
     list_display = ['id', 'task', 'status', 'stake_type', 'stake_amount', 'created_at']
@@ -9,6 +16,7 @@ class CommitmentAdmin(admin.ModelAdmin):
     search_fields = ['task__title', 'task__user__username']
     readonly_fields = ['created_at', 'updated_at', 'activated_at', 'completed_at']
     date_hierarchy = 'created_at'
+    list_select_related = ('task', 'task__user')
     
     fieldsets = (
         ('Task Link', {
@@ -30,6 +38,20 @@ class CommitmentAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related('task', 'task__user')
+        if _is_changelist(request):
+            queryset = queryset.only(
+                'id', 'task_title', 'status', 'stake_type', 'stake_amount', 'created_at',
+                'task__title', 'task__depth', 'task__user__username'
+            )
+        return queryset
+    
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'task':
+            kwargs['queryset'] = Task.objects.select_related('user')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
 @admin.register(Complaint)
@@ -39,6 +61,24 @@ class ComplaintAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'commitment__task__title', 'description']
     readonly_fields = ['created_at', 'updated_at', 'reviewed_at', 'refund_processed_at']
     date_hierarchy = 'created_at'
+    list_select_related = ('user', 'commitment', 'commitment__task')
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related(
+            'user', 'commitment', 'commitment__task'
+        )
+        if _is_changelist(request):
+            queryset = queryset.defer(
+                'description', 'review_notes',
+                'commitment__evidence_text', 'commitment__complaint',
+                'commitment__task__notes'
+            )
+        return queryset
+    
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'commitment':
+            kwargs['queryset'] = Commitment.objects.select_related('task', 'task__user')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
 @admin.register(EvidenceVerification)
@@ -48,3 +88,20 @@ class EvidenceVerificationAdmin(admin.ModelAdmin):
     search_fields = ['commitment__task__title', 'notes']
     readonly_fields = ['created_at', 'verified_at']
     date_hierarchy = 'created_at'
+    list_select_related = ('commitment', 'commitment__task', 'verified_by')
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related(
+            'commitment', 'commitment__task', 'verified_by'
+        )
+        if _is_changelist(request):
+            queryset = queryset.defer(
+                'notes', 'commitment__evidence_text', 'commitment__complaint',
+                'commitment__task__notes'
+            )
+        return queryset
+    
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'commitment':
+            kwargs['queryset'] = Commitment.objects.select_related('task', 'task__user')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
@@ -5,3 +5,6 @@ class CommitmentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.commitments'
     verbose_name = 'Commitments'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,106 @@
+"""
+Cache helpers for Commitments App.
+
+Usage:
+    from django.core.cache import cache
+    from apps.commitments.cache import cache_pipeline, set_tagged, invalidate_tags
+    
+    with cache_pipeline() as pipe:
+        pipe.get(cache.make_key('some_key'))
+        pipe.delete(cache.make_key('other_key'))
+        results = pipe.execute()
+    
+    # Tagged entries are dropped together when any of their tags is invalidated
+    set_tagged('commitment_dashboard_1', stats, tags={'user_commitments:1'})
+    invalidate_tags({'user_commitments:1'})
+"""
+
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+
+# Bumped to invalidate every user's dashboard at once; stale entries
+# are never read again and expire through their own TTL
+DASHBOARD_VERSION_KEY = 'commitment_dashboard_version'
+
+
+def dashboard_cache_key(user_id):
+    """Cache key for a user's commitment dashboard stats."""
+    version = cache.get(DASHBOARD_VERSION_KEY, 0)
+    return f"commitment_dashboard_v{version}_{user_id}"
+
+
+def bump_dashboard_version():
+    """Invalidate all cached dashboards with one INCR instead of a key scan."""
+    cache.add(DASHBOARD_VERSION_KEY, 0, timeout=None)
+    return cache.incr(DASHBOARD_VERSION_KEY)
+
+
+def user_commitments_tag(user_id):
+    """Tag covering every cached read over a user's commitments."""
+    return f'user_commitments:{user_id}'
+
+
+@contextmanager
+def cache_pipeline(alias='default', transaction=False):
+    """
+    Yield a Redis pipeline on the pooled connection behind a Django cache.
+    
+    Queued commands are sent in one round-trip when the caller runs
+    pipe.execute(). The pipeline talks to Redis directly, so keys must be
+    built with cache.make_key() and values are stored unserialized.
+    
+    Args:
+        alias: Cache alias from settings.CACHES
+        transaction: Wrap the queued commands in MULTI/EXEC
+    """
+    from django_redis import get_redis_connection
+    
+    pipe = get_redis_connection(alias).pipeline(transaction=transaction)
+    try:
+        yield pipe
+    finally:
+        pipe.reset()
+
+
+def _tag_key(tag):
+    """Redis key of the set holding every cache key registered under tag."""
+    return cache.make_key(f'tag:{tag}')
+
+
+def set_tagged(key, value, tags, timeout=None):
+    """
+    cache.set() a value and register its key under each tag.
+    
+    Args:
+        key: Cache key (unprefixed, as passed to cache.set)
+        value: Value to cache
+        tags: Iterable of tag strings, e.g. {'user_commitments:1'}
+        timeout: Seconds to keep the value (default: cache default timeout)
+    """
+    if timeout is None:
+        timeout = cache.default_timeout
+    
+    cache.set(key, value, timeout=timeout)
+    
+    full_key = cache.make_key(key)
+    with cache_pipeline() as pipe:
+        for tag in tags:
+            pipe.sadd(_tag_key(tag), full_key)
+            pipe.expire(_tag_key(tag), timeout)
+        pipe.execute()
+
+
+def invalidate_tags(tags):
+    """Delete every cache entry registered under any of the given tags."""
+    tag_keys = [_tag_key(tag) for tag in tags]
+    if not tag_keys:
+        return
+    
+    with cache_pipeline() as pipe:
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        keys = set(tag_keys).union(*pipe.execute())
+        pipe.delete(*keys)
+        pipe.execute()
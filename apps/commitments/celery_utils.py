@@ -0,0 +1,30 @@
+"""
+Celery helpers for Commitments App.
+
+Usage:
+    from apps.commitments.celery_utils import bulk_send
+    bulk_send([send_status_notification.s(commitment_id=1, new_status='failed')])
+"""
+
+from config.celery import app
+
+
+def bulk_send(signatures):
+    """
+    Enqueue several task signatures over a single broker connection.
+    
+    Calling .delay() in a loop acquires a producer (and connection) from
+    the pool for every message. This acquires one producer up front and
+    reuses its channel for every publish.
+    
+    Args:
+        signatures: Iterable of Celery signatures (e.g. task.s(...))
+        
+    Returns:
+        List of AsyncResult instances, in the same order as signatures
+    """
+    results = []
+    with app.producer_pool.acquire(block=True) as producer:
+        for signature in signatures:
+            results.append(signature.apply_async(producer=producer))
+    return results
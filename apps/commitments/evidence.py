@@ -0,0 +1,142 @@
+"""
+Evidence file processing for Commitments App.
+
+Heavy lifting is delegated to native code: Pillow (or the drop-in
+pillow-simd build) for images and an ffmpeg subprocess for videos.
+
+Usage:
+    from apps.commitments.evidence import is_processed, process_evidence
+    original_name = commitment.evidence_file.name
+    if not is_processed(original_name):
+        process_evidence(commitment.evidence_file)
+        # ... store commitment.evidence_file.name, then:
+        commitment.evidence_file.storage.delete(original_name)
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from io import BytesIO
+
+from django.core.files import File
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png'})
+VIDEO_EXTENSIONS = frozenset({'mp4', 'mov', 'avi'})
+
+# Longest edge of optimized evidence images
+IMAGE_MAX_SIZE = (1024, 1024)
+IMAGE_QUALITY = 85
+
+# x264 settings: favour encode speed, accept some quality loss
+VIDEO_CRF = '28'
+VIDEO_PRESET = 'veryfast'
+VIDEO_TIMEOUT = 20 * 60  # stay under CELERY_TASK_TIME_LIMIT
+
+# Processed files are saved into this subdirectory next to the original,
+# which marks them as done for is_processed()
+PROCESSED_DIR = 'processed'
+
+
+def file_extension(name):
+    """Lower-cased extension of name without the dot."""
+    return os.path.splitext(name)[1][1:].lower()
+
+
+def is_processed(name):
+    """Whether name is the output of process_evidence()."""
+    return os.path.basename(os.path.dirname(name)) == PROCESSED_DIR
+
+
+def _local_path(storage, name):
+    """Filesystem path of name, or None for remote storages (e.g. S3)."""
+    try:
+        return storage.path(name)
+    except NotImplementedError:
+        return None
+
+
+def _save_processed(field, content):
+    """
+    Save content under PROCESSED_DIR next to field's file and point
+    field.name at it.
+    
+    The original is not touched: the storage picks a free name, and the
+    caller deletes the original only once the new name is stored.
+    """
+    directory, basename = os.path.split(field.name)
+    field.name = field.storage.save(os.path.join(directory, PROCESSED_DIR, basename), content)
+
+
+def optimize_image(field):
+    """Downscale an image to IMAGE_MAX_SIZE and re-encode it into a new file."""
+    from PIL import Image
+    
+    with field.open('rb') as source, Image.open(source) as image:
+        image_format = image.format
+        image.thumbnail(IMAGE_MAX_SIZE, Image.LANCZOS)
+        buffer = BytesIO()
+        image.save(buffer, format=image_format, quality=IMAGE_QUALITY, optimize=True)
+    
+    _save_processed(field, ContentFile(buffer.getvalue()))
+
+
+def transcode_video(field):
+    """
+    Re-encode a video with x264 into a new file.
+    
+    ffmpeg reads local files directly and remote ones from the storage
+    URL, so large videos are streamed rather than downloaded first.
+    
+    Returns:
+        False if ffmpeg is not installed, True otherwise
+    
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg fails
+    """
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        logger.warning("ffmpeg not found, skipping video transcode")
+        return False
+    
+    storage, name = field.storage, field.name
+    source = _local_path(storage, name) or storage.url(name)
+    with tempfile.TemporaryDirectory() as workdir:
+        output = os.path.join(workdir, os.path.basename(name))
+        subprocess.run(
+            [
+                ffmpeg, '-y', '-loglevel', 'error', '-i', source,
+                '-vcodec', 'libx264', '-crf', VIDEO_CRF, '-preset', VIDEO_PRESET,
+                output,
+            ],
+            check=True,
+            timeout=VIDEO_TIMEOUT,
+        )
+        with open(output, 'rb') as transcoded:
+            _save_processed(field, File(transcoded))
+    return True
+
+
+def process_evidence(field):
+    """
+    Optimize an evidence file based on its extension.
+    
+    Works through the field's storage API, so it does not assume local
+    disk. The result is saved as a new file and field.name is pointed at
+    it; the original stays in storage until the caller has stored the
+    new name and deletes it, so a failure never loses the upload.
+    
+    Returns:
+        'image', 'video', or None if the file type is not processed
+    """
+    extension = file_extension(field.name)
+    if extension in IMAGE_EXTENSIONS:
+        optimize_image(field)
+        return 'image'
+    if extension in VIDEO_EXTENSIONS:
+        return 'video' if transcode_video(field) else None
+    return None
@@ -11,19 +11,43 @@ Usage:
     python manage.py test_celery --task=cache
 """
 
+from functools import lru_cache
+
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from datetime import timedelta
+
+
+@lru_cache(maxsize=None)
+def _celery_tasks():
+    """Import the Celery tasks on first use and reuse them afterwards."""
+    from config.celery import debug_task
+    from apps.commitments.tasks import check_overdue_commitments, send_deadline_reminders
+    
+    return {
+        'ping': debug_task,
+        'check_overdue': check_overdue_commitments,
+        'reminder': send_deadline_reminders,
+    }
 
 
 class Command(BaseCommand):
     help = 'Test Celery tasks for commitments'
+    
+    # --task choice -> handler method
+    _HANDLERS = {
+        'ping': 'test_ping',
+        'check_overdue': 'test_check_overdue',
+        'reminder': 'test_reminder',
+        'cache': 'test_cache',
+        'all': 'test_all',
+    }
+    # Celery tasks exercised by --task=all
+    _ALL_TASKS = ('ping', 'check_overdue')
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--task',
             type=str,
-            choices=['all', 'check_overdue', 'reminder', 'cache', 'ping'],
+            choices=list(self._HANDLERS),
             default='ping',
             help='Which task to test'
         )
@@ -34,81 +58,78 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        task_name = options['task']
-        sync = options['sync']
-        
-        if task_name == 'ping':
-            self.test_ping(sync)
-        elif task_name == 'check_overdue':
-            self.test_check_overdue(sync)
-        elif task_name == 'reminder':
-            self.test_reminder(sync)
-        elif task_name == 'cache':
-            self.test_cache(sync)
-        elif task_name == 'all':
-            self.test_ping(sync)
-            self.test_check_overdue(sync)
-            self.test_cache(sync)
+        getattr(self, self._HANDLERS[options['task']])(options['sync'])
     
-    def test_ping(self, sync=False):
-        """Test basic Celery connectivity."""
-        from config.celery import debug_task
-        
-        self.stdout.write(self.style.NOTICE('Testing Celery ping...'))
-        
+    def test_all(self, sync=False):
+        """Run every Celery task, then the cache test."""
         if sync:
-            debug_task()
-            self.stdout.write(self.style.SUCCESS('✅ Sync ping successful'))
+            for task_name in self._ALL_TASKS:
+                getattr(self, self._HANDLERS[task_name])(sync)
         else:
-            result = debug_task.delay()
-            self.stdout.write(self.style.SUCCESS(f'✅ Async task queued: {result.id}'))
+            self.test_bulk_send()
+        self.test_cache(sync)
     
-    def test_check_overdue(self, sync=False):
-        """Test the check_overdue_commitments task."""
-        from apps.commitments.tasks import check_overdue_commitments
+    def test_bulk_send(self):
+        """Queue the ping and check_overdue tasks over one connection."""
+        from apps.commitments.celery_utils import bulk_send
         
-        self.stdout.write(self.style.NOTICE('Testing check_overdue_commitments...'))
+        self.stdout.write(self.style.NOTICE('Testing bulk enqueue...'))
+        
+        tasks = _celery_tasks()
+        results = bulk_send(tasks[task_name].s() for task_name in self._ALL_TASKS)
+        for result in results:
+            self.stdout.write(self.style.SUCCESS(f'✅ Async task queued: {result.id}'))
+    
+    def _run_task(self, task_name, sync):
+        """Run a task inline with --sync, otherwise queue it."""
+        task = _celery_tasks()[task_name]
         
         if sync:
-            result = check_overdue_commitments()
+            result = task()
             self.stdout.write(self.style.SUCCESS(f'✅ Result: {result}'))
         else:
-            result = check_overdue_commitments.delay()
+            result = task.delay()
             self.stdout.write(self.style.SUCCESS(f'✅ Async task queued: {result.id}'))
     
+    def test_ping(self, sync=False):
+        """Test basic Celery connectivity."""
+        self.stdout.write(self.style.NOTICE('Testing Celery ping...'))
+        self._run_task('ping', sync)
+    
+    def test_check_overdue(self, sync=False):
+        """Test the check_overdue_commitments task."""
+        self.stdout.write(self.style.NOTICE('Testing check_overdue_commitments...'))
+        self._run_task('check_overdue', sync)
+    
     def test_reminder(self, sync=False):
         """Test the send_deadline_reminders task."""
-        from apps.commitments.tasks import send_deadline_reminders
-        
         self.stdout.write(self.style.NOTICE('Testing send_deadline_reminders...'))
-        
-        if sync:
-            result = send_deadline_reminders()
-            self.stdout.write(self.style.SUCCESS(f'✅ Result: {result}'))
-        else:
-            result = send_deadline_reminders.delay()
-            self.stdout.write(self.style.SUCCESS(f'✅ Async task queued: {result.id}'))
+        self._run_task('reminder', sync)
     
     def test_cache(self, sync=False):
-        """Test cache operations."""
+        """Test cache operations in a single pipelined round-trip."""
         from django.core.cache import cache
+        from apps.commitments.cache import cache_pipeline
         
         self.stdout.write(self.style.NOTICE('Testing Redis cache...'))
         
-        # Test set/get
-        cache.set('test_key', 'test_value', timeout=60)
-        value = cache.get('test_key')
+        key = cache.make_key('test_key')
+        
+        with cache_pipeline() as pipe:
+            pipe.set(key, 'test_value', ex=60)
+            pipe.get(key)
+            pipe.delete(key)
+            pipe.get(key)
+            _, value, _, deleted_value = pipe.execute()
         
-        if value == 'test_value':
+        # Test set/get
+        if value == b'test_value':
             self.stdout.write(self.style.SUCCESS('✅ Cache set/get working'))
         else:
             self.stdout.write(self.style.ERROR('❌ Cache set/get failed'))
         
         # Test delete
-        cache.delete('test_key')
-        value = cache.get('test_key')
-        
-        if value is None:
+        if deleted_value is None:
             self.stdout.write(self.style.SUCCESS('✅ Cache delete working'))
         else:
             self.stdout.write(self.style.ERROR('❌ Cache delete failed'))
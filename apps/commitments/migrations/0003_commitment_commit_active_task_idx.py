@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("commitments", "0002_commitmentattachment"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="commitment",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["task"],
+                name="commit_active_task_idx",
+            ),
+        ),
+    ]
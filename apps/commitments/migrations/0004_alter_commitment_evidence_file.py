@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-16 09:40
+
+import apps.commitments.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("commitments", "0003_commitment_commit_active_task_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="commitment",
+            name="evidence_file",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                upload_to="commitment_evidence/%Y/%m/%d/",
+                validators=[
+                    apps.commitments.validators.FrozenFileExtensionValidator(
+                        allowed_extensions=[
+                            "jpg",
+                            "jpeg",
+                            "png",
+                            "gif",
+                            "mp4",
+                            "mov",
+                            "avi",
+                        ]
+                    )
+                ],
+            ),
+        ),
+    ]
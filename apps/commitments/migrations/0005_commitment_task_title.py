@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-16 10:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_task_title(apps, schema_editor):
+    Commitment = apps.get_model("commitments", "Commitment")
+    Task = apps.get_model("tasks", "Task")
+    Commitment.objects.update(
+        task_title=Subquery(
+            Task.objects.filter(pk=OuterRef("task_id")).values("title")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0002_taskattachment"),
+        ("commitments", "0004_alter_commitment_evidence_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="commitment",
+            name="task_title",
+            field=models.CharField(blank=True, max_length=500),
+        ),
+        migrations.RunPython(populate_task_title, migrations.RunPython.noop),
+    ]
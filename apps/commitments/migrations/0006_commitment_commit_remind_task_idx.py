@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-16 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("commitments", "0005_commitment_task_title"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="commitment",
+            index=models.Index(
+                condition=models.Q(("evidence_submitted", False), ("status", "active")),
+                fields=["task"],
+                name="commit_remind_task_idx",
+            ),
+        ),
+    ]
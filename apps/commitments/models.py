@@ -9,12 +9,104 @@ Key Models:
 - Complaint: User appeals for failed commitments
 - EvidenceVerification: Admin verification workflow for submitted evidence
 """
+from functools import cached_property
+from itertools import islice
 from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.conf import settings
-from django.core.validators import MinValueValidator, MaxValueValidator, FileExtensionValidator
+from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from django.utils.crypto import salted_hmac
 from decimal import Decimal
 
+from .validators import FrozenFileExtensionValidator
+
+
+# Status groups used by transition guards (frozensets for O(1) membership)
+_TERMINAL_STATES = frozenset({'completed', 'cancelled', 'failed'})
+_UNCOMPLETABLE_STATES = frozenset({'completed', 'cancelled'})
+_ACTIVE_STATES = frozenset({'active', 'under_review'})
+_EVIDENCE_OPEN_STATES = frozenset({'active', 'paused'})
+_REVIEWED_STATES = frozenset({'approved', 'rejected'})
+
+# Rows per UPDATE when failing overdue commitments in bulk
+OVERDUE_BATCH_SIZE = 500
+
+# Storage prefix for evidence uploads (matches evidence_file.upload_to)
+EVIDENCE_KEY_PREFIX = 'commitment_evidence/'
+
+# Direct uploads go under EVIDENCE_UPLOADS_PREFIX<id>/<hmac>/, see
+# Commitment.evidence_upload_prefix
+EVIDENCE_UPLOADS_PREFIX = EVIDENCE_KEY_PREFIX + 'uploads/'
+
+# Shared across requests; the extension set is built once at import
+evidence_extension_validator = FrozenFileExtensionValidator(
+    allowed_extensions=['jpg', 'jpeg', 'png', 'gif', 'mp4', 'mov', 'avi']
+)
+
+
+def _batched(iterable, size):
+    """Yield lists of up to size items from iterable."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class CommitmentQuerySet(models.QuerySet):
+    """QuerySet with DB-side equivalents of Commitment properties."""
+    
+    def overdue(self, now=None):
+        """Commitments past their task deadline and not resolved (see is_overdue)."""
+        if now is None:
+            now = timezone.now()
+        return self.filter(status__in=_ACTIVE_STATES, task__due_date__lt=now)
+    
+    def status_summary(self):
+        """
+        Group rows by status in a single scan.
+        
+        Returns:
+            Dict mapping each status present to its row count, money stake
+            total and number of rows still waiting on evidence
+        """
+        rows = self.order_by().values('status').annotate(
+            count=models.Count('id'),
+            stakes=Coalesce(
+                models.Sum('stake_amount', filter=models.Q(stake_type='money')),
+                models.Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=10, decimal_places=2),
+            ),
+            pending_evidence=models.Count(
+                'id', filter=models.Q(evidence_required=True, evidence_submitted=False)
+            ),
+        )
+        return {row.pop('status'): row for row in rows}
+    
+    def dashboard_stats(self):
+        """
+        Compute dashboard counters from one grouped status query.
+        
+        Returns:
+            Dict with active/completed/failed/pending evidence counts,
+            total money stakes at risk and success rate (percent)
+        """
+        summary = self.status_summary()
+        empty = {'count': 0, 'stakes': Decimal('0.00'), 'pending_evidence': 0}
+        active = summary.get('active', empty)
+        stats = {
+            'active_count': active['count'],
+            'completed_count': summary.get('completed', empty)['count'],
+            'failed_count': summary.get('failed', empty)['count'],
+            'total_stakes_at_risk': active['stakes'],
+            'pending_evidence_count': active['pending_evidence'],
+        }
+        
+        total_resolved = stats['completed_count'] + stats['failed_count']
+        success_rate = (stats['completed_count'] / total_resolved * 100) if total_resolved > 0 else 0
+        stats['success_rate'] = round(success_rate, 1)
+        
+        return stats
+
 
 class Commitment(models.Model):
     """
@@ -37,6 +129,7 @@ class Commitment(models.Model):
         ('appealed', 'Appealed'),
         ('under_review', 'Under Review'),
     ]
+    STATUS_DISPLAY = dict(STATUS_CHOICES)
     
     LENIENCY_CHOICES = [
         ('lenient', 'Lenient - Easy appeal requirements'),
@@ -72,6 +165,9 @@ class Commitment(models.Model):
         related_name='commitment',
         help_text='The task this commitment is attached to'
     )
+    # Denormalized copy of task.title so __str__ never needs a JOIN.
+    # Kept in sync by the Task post_save handler in signals.py.
+    task_title = models.CharField(max_length=500, blank=True)
     
     # ========== STATUS & STAKES ==========
     status = models.CharField(
@@ -115,10 +211,10 @@ class Commitment(models.Model):
         default='self_verification'
     )
     evidence_file = models.FileField(
-        upload_to='commitment_evidence/%Y/%m/%d/',
+        upload_to=EVIDENCE_KEY_PREFIX + '%Y/%m/%d/',
         blank=True,
         null=True,
-        validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'gif', 'mp4', 'mov', 'avi'])]
+        validators=[evidence_extension_validator]
     )
     evidence_text = models.TextField(
         blank=True,
@@ -137,6 +233,8 @@ class Commitment(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
     activated_at = models.DateTimeField(null=True, blank=True)
     
+    objects = CommitmentQuerySet.as_manager()
+    
     class Meta:
         db_table = 'commitments'
         verbose_name = "Commitment"
@@ -145,23 +243,86 @@ class Commitment(models.Model):
         indexes = [
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['stake_type', 'status']),
+            # Overdue sweep: scan only active rows, then join tasks on task_id
+            # (tasks.due_date is covered by task_due_date_idx)
+            models.Index(
+                fields=['task'],
+                name='commit_active_task_idx',
+                condition=models.Q(status='active')
+            ),
+            # Reminder sweep: active rows still waiting on evidence
+            models.Index(
+                fields=['task'],
+                name='commit_remind_task_idx',
+                condition=models.Q(status='active', evidence_submitted=False)
+            ),
         ]
     
     def __str__(self):
-        return f"Commitment: {self.task.title} ({self.get_status_display()})"
+        return f"Commitment: {self.task_title or self.task_id} ({self.get_status_display()})"
+    
+    def get_status_display(self):
+        return self.STATUS_DISPLAY.get(self.status, self.status)
+    
+    def save(self, *args, **kwargs):
+        """
+        Populate the denormalized task title on first save, and drop cached
+        reads for this commitment once the write commits.
+        """
+        if self.task_id and not self.task_title:
+            self.task_title = self.task.title
+            # Partial saves would otherwise drop the filled-in title
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'task_title'}
+        super().save(*args, **kwargs)
+        self._invalidate_cached_reads()
     
-    # ========== PROPERTIES ==========
     @property
+    def cache_tags(self):
+        """Cache tags covering reads that include this commitment."""
+        from .cache import user_commitments_tag
+        
+        return {f'commitment:{self.pk}', user_commitments_tag(self.task.user_id)}
+    
+    def _invalidate_cached_reads(self):
+        """
+        Invalidate cache_tags once the write commits.
+        
+        The owner comes from the loaded task (views and Celery tasks
+        select_related it). Otherwise it is looked up after the commit
+        rather than as an extra query inside every save().
+        """
+        from apps.tasks.models import Task
+        from .cache import invalidate_tags, user_commitments_tag
+        
+        if Commitment.task.is_cached(self):
+            tags = self.cache_tags
+            transaction.on_commit(lambda: invalidate_tags(tags), robust=True)
+            return
+        
+        pk, task_id = self.pk, self.task_id
+        
+        def invalidate():
+            user_id = Task.objects.filter(pk=task_id).values_list('user_id', flat=True).first()
+            invalidate_tags({f'commitment:{pk}', user_commitments_tag(user_id)})
+        
+        transaction.on_commit(invalidate, robust=True)
+    
+    # ========== PROPERTIES ==========
+    # Task-derived values are cached per instance; load lists with
+    # select_related('task', 'task__user') so the first read does not query.
+    @cached_property
     def user(self):
         """Get user from linked task"""
         return self.task.user
     
-    @property
+    @cached_property
     def title(self):
         """Get title from linked task"""
         return self.task.title
     
-    @property
+    @cached_property
     def due_date(self):
         """Get due date from linked task"""
         return self.task.due_date
@@ -174,63 +335,162 @@ class Commitment(models.Model):
     @property
     def is_overdue(self):
         """Check if commitment is past deadline and not resolved"""
-        if self.status not in ['active', 'under_review']:
+        if self.status not in _ACTIVE_STATES:
             return False
-        if not self.task.due_date:
+        if not self.due_date:
             return False
-        return timezone.now() > self.task.due_date
+        return timezone.now() > self.due_date
     
     @property
     def is_paid_commitment(self):
         """Check if this is a financial commitment"""
         return self.stake_type == 'money'
     
+    # ========== BULK OPERATIONS ==========
+    @classmethod
+    def bulk_mark_overdue(cls, now=None, reason=''):
+        """
+        Fail every active commitment whose task deadline has passed.
+        
+        Runs one UPDATE per batch of OVERDUE_BATCH_SIZE rows instead of
+        calling mark_failed() per row. IDs are streamed (and locked) first
+        so the UPDATEs themselves do not need to join the tasks table.
+        
+        Returns:
+            List of IDs of the commitments that were failed
+        """
+        if now is None:
+            now = timezone.now()
+        
+        updates = {'status': 'failed', 'completed_at': now, 'updated_at': now}
+        if reason:
+            updates['complaint'] = reason
+        
+        overdue_ids = []
+        with transaction.atomic():
+            locked_ids = cls.objects.select_for_update(of=('self',)).overdue(now).filter(
+                status='active'
+            ).values_list('id', flat=True).iterator(chunk_size=OVERDUE_BATCH_SIZE)
+            
+            for batch in _batched(locked_ids, OVERDUE_BATCH_SIZE):
+                cls.objects.filter(id__in=batch).update(**updates)
+                overdue_ids.extend(batch)
+        
+        return overdue_ids
+    
     # ========== STATE TRANSITIONS ==========
+    # Only wrap writes in transaction.atomic() when more than one row is
+    # mutated; a single UPDATE is already atomic under autocommit.
     def activate(self):
         """Activate a draft commitment"""
         if self.status != 'draft':
             raise ValueError(f"Only draft commitments can be activated, this is {self.status}")
         
-        if self.task.due_date and self.task.due_date <= timezone.now():
+        now = timezone.now()
+        if self.task.due_date and self.task.due_date <= now:
             raise ValueError("Cannot activate commitment with past deadline")
         
-        with transaction.atomic():
-            self.status = 'active'
-            self.activated_at = timezone.now()
-            self.save()
+        self.status = 'active'
+        self.activated_at = now
+        self.save(update_fields=['status', 'activated_at', 'updated_at'])
         return self
     
-    def submit_evidence(self, evidence_type=None, evidence_file=None, evidence_text=''):
-        """Submit evidence for completion"""
-        if self.status not in ['active', 'paused']:
+    def submit_evidence(self, evidence_type=None, evidence_file=None, evidence_text='',
+                        evidence_key=None):
+        """
+        Submit evidence for completion.
+        
+        Large files can be uploaded straight to storage by the client and
+        passed as evidence_key (the stored object name); the key is recorded
+        as-is, without streaming the file through this process. Keys must
+        sit under this commitment's evidence_upload_prefix.
+        """
+        if self.status not in _EVIDENCE_OPEN_STATES:
             raise ValueError(f"Cannot submit evidence for {self.status} commitment")
         
         if self.evidence_required and not evidence_type:
             raise ValueError("Evidence type is required for this commitment")
         
-        if self.task.due_date and timezone.now() > self.task.due_date:
+        now = timezone.now()
+        if self.task.due_date and now > self.task.due_date:
             raise ValueError("Cannot submit evidence after deadline")
         
+        update_fields = ['evidence_submitted', 'evidence_submitted_at', 'updated_at']
+        
         if evidence_type:
             self.evidence_type = evidence_type
+            update_fields.append('evidence_type')
         if evidence_file:
             self.evidence_file = evidence_file
+            update_fields.append('evidence_file')
+        elif evidence_key:
+            self._check_evidence_key(evidence_key)
+            self.evidence_file.name = evidence_key
+            update_fields.append('evidence_file')
         if evidence_text:
             self.evidence_text = evidence_text
+            update_fields.append('evidence_text')
         
         self.evidence_submitted = True
-        self.evidence_submitted_at = timezone.now()
+        self.evidence_submitted_at = now
         
         # Self-verification is instant, others need review
         if self.evidence_type != 'self_verification':
             self.status = 'under_review'
+            update_fields.append('status')
         
-        self.save()
+        self.save(update_fields=update_fields)
+        if 'evidence_file' in update_fields:
+            self._queue_evidence_processing()
         return self
     
-    def mark_completed(self):
-        """Mark commitment as completed"""
-        if self.status in ['completed', 'cancelled']:
+    def _queue_evidence_processing(self):
+        """
+        Queue process_evidence_file for after the current transaction commits.
+        
+        The task runs on the 'media' queue (see CELERY_TASK_ROUTES), so
+        it only sees the new evidence_file once the row is committed.
+        """
+        from .tasks import process_evidence_file
+        
+        commitment_id = self.pk
+        transaction.on_commit(lambda: process_evidence_file.delay(commitment_id))
+    
+    @property
+    def evidence_upload_prefix(self):
+        """
+        Storage prefix the owner uploads this commitment's evidence under.
+        
+        The path carries an HMAC of the commitment id, so it is only known
+        to clients the server handed it to (the evidence_upload action)
+        and cannot be derived for someone else's commitment.
+        """
+        token = salted_hmac('commitment_evidence_upload', str(self.pk)).hexdigest()[:32]
+        return f"{EVIDENCE_UPLOADS_PREFIX}{self.pk}/{token}/"
+    
+    def _check_evidence_key(self, evidence_key):
+        """Ensure a client-supplied storage key is this commitment's stored upload."""
+        if not isinstance(evidence_key, str):
+            raise ValueError("Invalid evidence key")
+        if not evidence_key.startswith(self.evidence_upload_prefix) or '..' in evidence_key:
+            raise ValueError("Invalid evidence key")
+        
+        extension = evidence_key.rsplit('.', 1)[-1].lower()
+        if extension not in evidence_extension_validator.allowed_extensions:
+            raise ValueError(f"File type .{extension} is not allowed")
+        
+        if not self.evidence_file.storage.exists(evidence_key):
+            raise ValueError("Evidence file was not found in storage")
+    
+    def _apply_completion(self, now):
+        """
+        Validate and apply completion to this commitment and its task in
+        memory, without saving.
+        
+        Returns:
+            True if the linked task was changed and needs saving
+        """
+        if self.status in _UNCOMPLETABLE_STATES:
             raise ValueError(f"Cannot complete a {self.status} commitment")
         
         if self.status == 'failed':
@@ -239,51 +499,94 @@ class Commitment(models.Model):
         if self.evidence_type != 'self_verification' and self.status != 'under_review':
             raise ValueError("This commitment requires evidence verification before completion")
         
+        self.status = 'completed'
+        self.completed_at = now
+        
+        # Also complete the linked task
+        if self.task.status != 'COMPLETED':
+            self.task.status = 'COMPLETED'
+            self.task.completed_at = now
+            return True
+        return False
+    
+    def _save_completion(self, task_changed):
+        """Persist fields set by _apply_completion()."""
+        self.save(update_fields=['status', 'completed_at', 'updated_at'])
+        if task_changed:
+            self.task.save(update_fields=['status', 'completed_at', 'updated_at'])
+        self._queue_status_notification()
+    
+    def _queue_status_notification(self, message=''):
+        """
+        Queue a status notification for after the current transaction commits.
+        
+        Nothing is sent if the transaction rolls back, and the broker
+        round-trip stays out of the transaction.
+        """
+        from .tasks import send_status_notification
+        
+        commitment_id, new_status = self.pk, self.status
+        transaction.on_commit(
+            lambda: send_status_notification.delay(
+                commitment_id=commitment_id,
+                new_status=new_status,
+                message=message
+            )
+        )
+    
+    def mark_completed(self):
+        """Mark commitment as completed"""
+        task_changed = self._apply_completion(timezone.now())
+        
         with transaction.atomic():
-            self.status = 'completed'
-            self.completed_at = timezone.now()
-            self.save()
-            
-            # Also complete the linked task
-            if self.task.status != 'COMPLETED':
-                self.task.status = 'COMPLETED'
-                self.task.completed_at = timezone.now()
-                self.task.save()
+            self._save_completion(task_changed)
         
         return self
     
+    def _apply_failure(self, now, reason=''):
+        """
+        Validate and apply failure in memory, without saving.
+        
+        Returns:
+            List of changed field names for save(update_fields=...)
+        """
+        if self.status in _TERMINAL_STATES:
+            raise ValueError(f"Cannot fail a {self.status} commitment")
+        
+        self.status = 'failed'
+        update_fields = ['status', 'completed_at', 'updated_at']
+        if reason:
+            self.complaint = reason
+            update_fields.append('complaint')
+        self.completed_at = now
+        return update_fields
+    
     def mark_failed(self, reason=''):
         """Mark commitment as failed"""
-        if self.status in ['completed', 'cancelled', 'failed']:
-            raise ValueError(f"Cannot fail a {self.status} commitment")
+        update_fields = self._apply_failure(timezone.now(), reason=reason)
         
         with transaction.atomic():
-            self.status = 'failed'
-            if reason:
-                self.complaint = reason
-            self.completed_at = timezone.now()
-            self.save()
+            self.save(update_fields=update_fields)
+            self._queue_status_notification()
         
         return self
     
     def cancel(self):
         """Cancel a commitment"""
-        if self.status in ['completed', 'failed', 'cancelled']:
+        if self.status in _TERMINAL_STATES:
             raise ValueError(f"Cannot cancel a {self.status} commitment")
         
-        with transaction.atomic():
-            self.status = 'cancelled'
-            self.save()
+        self.status = 'cancelled'
+        self.save(update_fields=['status', 'updated_at'])
         return self
     
     def pause(self):
         """Pause an active commitment"""
-        if self.status not in ['active', 'under_review']:
+        if self.status not in _ACTIVE_STATES:
             raise ValueError("Only active or under_review commitments can be paused")
         
-        with transaction.atomic():
-            self.status = 'paused'
-            self.save()
+        self.status = 'paused'
+        self.save(update_fields=['status', 'updated_at'])
         return self
     
     def resume(self):
@@ -294,12 +597,11 @@ class Commitment(models.Model):
         if self.task.due_date and timezone.now() > self.task.due_date:
             raise ValueError("Cannot resume overdue commitment")
         
-        with transaction.atomic():
-            if self.evidence_submitted:
-                self.status = 'under_review'
-            else:
-                self.status = 'active'
-            self.save()
+        if self.evidence_submitted:
+            self.status = 'under_review'
+        else:
+            self.status = 'active'
+        self.save(update_fields=['status', 'updated_at'])
         return self
 
 
@@ -312,6 +614,7 @@ class Complaint(models.Model):
         ('approved', 'Approved - Refund Granted'),
         ('rejected', 'Rejected'),
     ]
+    STATUS_DISPLAY = dict(STATUS_CHOICES)
     
     REASON_CHOICES = [
         ('technical_issue', 'Technical Issue'),
@@ -321,6 +624,7 @@ class Complaint(models.Model):
         ('deadline_dispute', 'Deadline Dispute'),
         ('other', 'Other'),
     ]
+    REASON_DISPLAY = dict(REASON_CHOICES)
     
     # Relationships
     user = models.ForeignKey(
@@ -395,17 +699,23 @@ class Complaint(models.Model):
     def __str__(self):
         return f"Complaint #{self.id} - {self.user.username} - {self.get_status_display()}"
     
+    def get_status_display(self):
+        return self.STATUS_DISPLAY.get(self.status, self.status)
+    
+    def get_reason_category_display(self):
+        return self.REASON_DISPLAY.get(self.reason_category, self.reason_category)
+    
     @property
     def is_pending(self):
         return self.status == 'pending'
     
     @property
     def is_resolved(self):
-        return self.status in ['approved', 'rejected']
+        return self.status in _REVIEWED_STATES
     
     def approve(self, reviewed_by, review_notes='', refund_amount=None):
         """Approve complaint and set refund amount"""
-        if self.status in ['approved', 'rejected']:
+        if self.status in _REVIEWED_STATES:
             raise ValueError(f"Cannot approve complaint with status: {self.status}")
         
         with transaction.atomic():
@@ -419,18 +729,24 @@ class Complaint(models.Model):
             elif self.commitment.stake_amount:
                 self.refund_amount = self.commitment.stake_amount
             
-            self.save()
+            self.save(update_fields=[
+                'status', 'reviewed_by', 'review_notes', 'reviewed_at',
+                'refund_amount', 'updated_at'
+            ])
             
             # Update commitment status
             if self.commitment.status == 'failed':
                 self.commitment.status = 'appealed'
-                self.commitment.save()
+                self.commitment.save(update_fields=['status', 'updated_at'])
+                self.commitment._queue_status_notification(
+                    message='Your appeal was approved.'
+                )
         
         return self
     
     def reject(self, reviewed_by, review_notes=''):
         """Reject complaint"""
-        if self.status in ['approved', 'rejected']:
+        if self.status in _REVIEWED_STATES:
             raise ValueError(f"Cannot reject complaint with status: {self.status}")
         
         with transaction.atomic():
@@ -438,7 +754,9 @@ class Complaint(models.Model):
             self.reviewed_by = reviewed_by
             self.review_notes = review_notes
             self.reviewed_at = timezone.now()
-            self.save()
+            self.save(update_fields=[
+                'status', 'reviewed_by', 'review_notes', 'reviewed_at', 'updated_at'
+            ])
         return self
 
 
@@ -451,6 +769,7 @@ class EvidenceVerification(models.Model):
         ('rejected', 'Rejected'),
         ('needs_more_info', 'Needs More Information'),
     ]
+    STATUS_DISPLAY = dict(STATUS_CHOICES)
     
     # Relationships
     commitment = models.OneToOneField(
@@ -491,43 +810,63 @@ class EvidenceVerification(models.Model):
     def __str__(self):
         return f"Evidence Verification for {self.commitment.task.title} - {self.get_status_display()}"
     
+    def get_status_display(self):
+        return self.STATUS_DISPLAY.get(self.status, self.status)
+    
     @property
     def is_pending(self):
         return self.status == 'pending'
     
     def approve(self, verified_by, notes=''):
         """Approve evidence and complete commitment"""
-        if self.status in ['approved', 'rejected']:
+        if self.status in _REVIEWED_STATES:
             raise ValueError(f"Cannot approve verification with status: {self.status}")
         
+        now = timezone.now()
+        commitment = self.commitment
+        
+        # Mark commitment as completed (validated before anything is written)
+        complete_commitment = commitment.status in _ACTIVE_STATES
+        if complete_commitment:
+            task_changed = commitment._apply_completion(now)
+        
+        self.status = 'approved'
+        self.verified_by = verified_by
+        self.notes = notes
+        self.verified_at = now
+        
         with transaction.atomic():
-            self.status = 'approved'
-            self.verified_by = verified_by
-            self.notes = notes
-            self.verified_at = timezone.now()
-            self.save()
-            
-            # Mark commitment as completed
-            if self.commitment.status in ['active', 'under_review']:
-                self.commitment.mark_completed()
+            self.save(update_fields=['status', 'verified_by', 'notes', 'verified_at'])
+            if complete_commitment:
+                commitment._save_completion(task_changed)
         
         return self
     
     def reject(self, verified_by, notes=''):
         """Reject evidence and mark commitment as failed"""
-        if self.status in ['approved', 'rejected']:
+        if self.status in _REVIEWED_STATES:
             raise ValueError(f"Cannot reject verification with status: {self.status}")
         
+        now = timezone.now()
+        commitment = self.commitment
+        
+        # Mark commitment as failed
+        fail_commitment = commitment.status in _ACTIVE_STATES
+        if fail_commitment:
+            commitment_fields = commitment._apply_failure(
+                now, reason=f'Evidence rejected: {notes}'
+            )
+        
+        self.status = 'rejected'
+        self.verified_by = verified_by
+        self.notes = notes
+        self.verified_at = now
+        
         with transaction.atomic():
-            self.status = 'rejected'
-            self.verified_by = verified_by
-            self.notes = notes
-            self.verified_at = timezone.now()
-            self.save()
-            
-            # Mark commitment as failed
-            if self.commitment.status in ['active', 'under_review']:
-                self.commitment.mark_failed(reason=f'Evidence rejected: {notes}')
+            self.save(update_fields=['status', 'verified_by', 'notes', 'verified_at'])
+            if fail_commitment:
+                commitment.save(update_fields=commitment_fields)
+                commitment._queue_status_notification()
         
         return self
     
@@ -537,7 +876,7 @@ class EvidenceVerification(models.Model):
         self.verified_by = verified_by
         self.notes = notes
         self.verified_at = timezone.now()
-        self.save()
+        self.save(update_fields=['status', 'verified_by', 'notes', 'verified_at'])
         return self
 
 
@@ -556,6 +895,7 @@ class CommitmentAttachment(models.Model):
         ('document', 'Document'),
         ('other', 'Other'),
     ]
+    ATTACHMENT_TYPE_DISPLAY = dict(ATTACHMENT_TYPE_CHOICES)
     
     commitment = models.ForeignKey(
         Commitment,
@@ -614,6 +954,9 @@ class CommitmentAttachment(models.Model):
     def __str__(self):
         return f"{self.commitment.task.title} - {self.file_name} ({self.get_attachment_type_display()})"
     
+    def get_attachment_type_display(self):
+        return self.ATTACHMENT_TYPE_DISPLAY.get(self.attachment_type, self.attachment_type)
+    
     def save(self, *args, **kwargs):
         """Auto-populate file metadata on save."""
         if self.file and not self.file_name:
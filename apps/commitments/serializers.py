@@ -9,12 +9,37 @@ Supports:
 
 from rest_framework import serializers
 from django.db import transaction
+from django.db.models import Exists, OuterRef
 from django.conf import settings
 from .models import Commitment, Complaint, EvidenceVerification, CommitmentAttachment
 from apps.tasks.models import Task, List
 from apps.tasks.serializers import TaskSerializer
 
 
+class UserListField(serializers.PrimaryKeyRelatedField):
+    """List primary key, restricted to the requesting user's lists."""
+    
+    def get_queryset(self):
+        request = self.context.get('request')
+        if request is None:
+            return List.objects.none()
+        return List.objects.filter(user=request.user)
+
+
+class TaskCreateInlineSerializer(serializers.ModelSerializer):
+    """Writable task fields accepted by CommitmentSerializer.task_data."""
+    
+    list_id = UserListField(source='list', required=False, allow_null=True)
+    
+    class Meta:
+        model = Task
+        fields = [
+            'title', 'notes', 'status', 'priority',
+            'due_date', 'start_date', 'duration_minutes',
+            'recurrence', 'list_id'
+        ]
+
+
 class CommitmentSerializer(serializers.ModelSerializer):
     """
     Serializer for Commitment model.
@@ -29,13 +54,13 @@ class CommitmentSerializer(serializers.ModelSerializer):
     
     # Write options
     task_id = serializers.IntegerField(write_only=True, required=False)
-    task_data = serializers.DictField(write_only=True, required=False)
+    task_data = TaskCreateInlineSerializer(write_only=True, required=False)
     
     # Computed fields
     title = serializers.CharField(read_only=True)
     due_date = serializers.DateTimeField(read_only=True)
     is_overdue = serializers.BooleanField(read_only=True)
-    is_paid = serializers.SerializerMethodField()
+    is_paid = serializers.BooleanField(source='is_paid_commitment', read_only=True)
     
     class Meta:
         model = Commitment
@@ -61,8 +86,12 @@ class CommitmentSerializer(serializers.ModelSerializer):
             'evidence_submitted', 'evidence_submitted_at'
         ]
     
-    def get_is_paid(self, obj):
-        return obj.is_paid_commitment
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join/prefetch everything the nested task representation reads."""
+        return queryset.select_related(
+            'task', 'task__list', 'task__user'
+        ).prefetch_related('task__tags')
     
     def validate(self, attrs):
         """Ensure either task_id or task_data is provided, but not both."""
@@ -86,17 +115,21 @@ class CommitmentSerializer(serializers.ModelSerializer):
         if task_id:
             request = self.context.get('request')
             if request and request.user:
-                try:
-                    task = Task.objects.get(id=task_id, user=request.user)
-                    # Check if task already has a commitment
-                    if hasattr(task, 'commitment'):
-                        raise serializers.ValidationError(
-                            "This task already has a commitment attached"
-                        )
-                except Task.DoesNotExist:
+                # Semi-join on commitments.task_id instead of loading the row
+                task = Task.objects.filter(id=task_id, user=request.user).annotate(
+                    has_commitment=Exists(Commitment.objects.filter(task=OuterRef('pk')))
+                ).first()
+                if task is None:
                     raise serializers.ValidationError(
                         "Task not found or does not belong to you"
                     )
+                # Check if task already has a commitment
+                if task.has_commitment:
+                    raise serializers.ValidationError(
+                        "This task already has a commitment attached"
+                    )
+                # Reused by create() so the task is not fetched twice
+                attrs['_task'] = task
         
         return attrs
     
@@ -104,22 +137,22 @@ class CommitmentSerializer(serializers.ModelSerializer):
         """Create commitment with task linking or creation."""
         task_id = validated_data.pop('task_id', None)
         task_data = validated_data.pop('task_data', None)
+        validated_task = validated_data.pop('_task', None)
         
         request = self.context.get('request')
         user = request.user if request else None
         
         with transaction.atomic():
             if task_id:
-                # Link to existing task
-                task = Task.objects.get(id=task_id, user=user)
+                # Link to existing task (already loaded by validate())
+                task = validated_task or Task.objects.get(id=task_id, user=user)
             else:
-                # Create new task from task_data
+                # Create new task from validated task_data
                 task_data['user'] = user
                 
-                # Handle list - use default or provided
-                if 'list_id' in task_data:
-                    task_data['list_id'] = task_data.pop('list_id')
-                else:
+                # Handle list - use default or provided (already resolved
+                # to one of the user's lists by TaskCreateInlineSerializer)
+                if task_data.get('list') is None:
                     # Get or create default list for user
                     default_list, _ = List.objects.get_or_create(
                         user=user,
@@ -150,6 +183,15 @@ class CommitmentListSerializer(serializers.ModelSerializer):
             'id', 'title', 'status', 'stake_type', 'stake_amount',
             'due_date', 'is_overdue', 'evidence_submitted', 'created_at'
         ]
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the task and load only the columns listed above."""
+        return queryset.select_related('task').only(
+            'id', 'status', 'stake_type', 'stake_amount',
+            'evidence_submitted', 'created_at',
+            'task__title', 'task__due_date'
+        )
 
 
 class ComplaintSerializer(serializers.ModelSerializer):
@@ -172,15 +214,21 @@ class ComplaintSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
     
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the commitment's task (and owner) read by commitment_title."""
+        return queryset.select_related('commitment', 'commitment__task', 'commitment__task__user')
+    
     def validate_commitment(self, value):
         """Ensure user owns the commitment and it's in a valid state."""
         request = self.context.get('request')
         user = request.user if request else None
         
-        if value.task.user != user:
+        # One EXISTS instead of lazily loading value.task and value.task.user
+        if user is None or not Commitment.objects.filter(pk=value.pk, task__user=user).exists():
             raise serializers.ValidationError("You don't own this commitment")
         
-        if value.status not in ['failed']:
+        if value.status != 'failed':
             raise serializers.ValidationError(
                 "Complaints can only be filed for failed commitments"
             )
@@ -206,6 +254,11 @@ class EvidenceVerificationSerializer(serializers.ModelSerializer):
             'created_at'
         ]
         read_only_fields = ['verified_by', 'verified_at', 'created_at']
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the commitment's task (and owner) read by commitment_title."""
+        return queryset.select_related('commitment', 'commitment__task', 'commitment__task__user')
 
 
 class CommitmentDashboardSerializer(serializers.Serializer):
@@ -0,0 +1,25 @@
+"""
+Signal handlers for Commitments App.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.tasks.models import Task
+from .models import Commitment
+
+
+@receiver(post_save, sender=Task)
+def sync_commitment_task_title(sender, instance, created, update_fields=None, **kwargs):
+    """Keep Commitment.task_title in sync when a task is renamed."""
+    if created:
+        return
+    if update_fields is not None and 'title' not in update_fields:
+        return
+    # Title as loaded by Task.from_db (absent if it was deferred)
+    if getattr(instance, '_loaded_title', None) == instance.title:
+        return
+    Commitment.objects.filter(task_id=instance.pk).exclude(
+        task_title=instance.title
+    ).update(task_title=instance.title)
+    instance._loaded_title = instance.title
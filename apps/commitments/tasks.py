@@ -16,15 +16,28 @@ Usage:
 """
 
 import logging
+import subprocess
 from celery import shared_task
+from django.db import transaction
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
 from datetime import timedelta
 from django.core.cache import cache
 
+from .cache import bump_dashboard_version, dashboard_cache_key, set_tagged, user_commitments_tag
+from .celery_utils import bulk_send
+from .evidence import is_processed, process_evidence
+
 logger = logging.getLogger(__name__)
 
+# Commitments per broker message when fanning out bulk status changes
+NOTIFICATION_CHUNK_SIZE = 200
+
+# Reminders per broker message; each one renders an email, so keep chunks
+# small enough to spread across workers
+REMINDER_CHUNK_SIZE = 50
+
 
 # =============================================================================
 # SCHEDULED TASKS (Celery Beat)
@@ -45,36 +58,29 @@ def check_overdue_commitments(self):
     
     now = timezone.now()
     
-    # Find overdue active commitments
-    overdue_commitments = Commitment.objects.filter(
-        status='active',
-        task__due_date__lt=now
-    ).select_related('task', 'task__user')
-    
-    failed_count = 0
-    
-    for commitment in overdue_commitments:
-        try:
-            commitment.mark_failed(reason='Deadline passed - auto-failed by system')
-            failed_count += 1
-            logger.info(f"Auto-failed commitment {commitment.id}: {commitment.title}")
-            
-            # Queue notification task
-            send_status_notification.delay(
-                commitment_id=commitment.id,
-                new_status='failed',
-                message='Your commitment has been automatically marked as failed because the deadline passed.'
-            )
-            
-        except Exception as e:
-            logger.error(f"Failed to auto-fail commitment {commitment.id}: {e}")
-            continue
+    # Fail all overdue active commitments in one UPDATE
+    failed_ids = Commitment.bulk_mark_overdue(
+        now=now,
+        reason='Deadline passed - auto-failed by system'
+    )
+    failed_count = len(failed_ids)
     
-    # Invalidate dashboard cache for affected users
     if failed_count > 0:
+        logger.info(f"Auto-failed {failed_count} overdue commitments")
+        
+        # Queue notifications in chunks: one broker message per
+        # NOTIFICATION_CHUNK_SIZE commitments, published over one connection
+        message = 'Your commitment has been automatically marked as failed because the deadline passed.'
+        notifications = send_status_notification.chunks(
+            [(commitment_id, 'failed', message) for commitment_id in failed_ids],
+            NOTIFICATION_CHUNK_SIZE
+        )
+        bulk_send(notifications.group().tasks)
+        
+        # Invalidate dashboard cache for affected users
         invalidate_dashboard_cache.delay()
     
-    return f"Checked {overdue_commitments.count()} overdue commitments, failed {failed_count}"
+    return f"Failed {failed_count} overdue commitments"
 
 
 @shared_task(bind=True, max_retries=3)
@@ -96,38 +102,43 @@ def send_deadline_reminders(self):
     fifteen_minutes_from_now = now + timedelta(minutes=15)
     
     # Find commitments due within an hour
-    upcoming_commitments = Commitment.objects.filter(
+    upcoming = list(Commitment.objects.filter(
         status='active',
         evidence_submitted=False,
         task__due_date__gt=now,
         task__due_date__lte=one_hour_from_now
-    ).select_related('task', 'task__user')
+    ).values_list('id', 'task__due_date'))
+    
+    # Idle beat runs stop here: no cache round-trip, no broker connection
+    if not upcoming:
+        return "Sent 0 reminders"
     
-    reminder_count = 0
+    # Skip commitments we've already reminded recently (one MGET for all)
+    cache_keys = {commitment_id: f"reminder_sent_{commitment_id}" for commitment_id, _ in upcoming}
+    already_sent = cache.get_many(cache_keys.values())
     
-    for commitment in upcoming_commitments:
-        # Check if we've already sent a reminder recently
-        cache_key = f"reminder_sent_{commitment.id}"
-        if cache.get(cache_key):
+    reminders = []
+    for commitment_id, due_date in upcoming:
+        if cache_keys[commitment_id] in already_sent:
             continue
         
-        try:
-            # Determine urgency
-            time_left = commitment.task.due_date - now
-            is_final_warning = time_left <= timedelta(minutes=20)
-            
-            send_commitment_reminder.delay(
-                commitment_id=commitment.id,
-                is_final_warning=is_final_warning
-            )
-            
-            # Mark as reminded (cache for 30 minutes to avoid spam)
-            cache.set(cache_key, True, timeout=30 * 60)
-            reminder_count += 1
-            
-        except Exception as e:
-            logger.error(f"Failed to send reminder for commitment {commitment.id}: {e}")
-            continue
+        # Determine urgency
+        time_left = due_date - now
+        is_final_warning = time_left <= timedelta(minutes=20)
+        reminders.append((commitment_id, is_final_warning))
+    
+    reminder_count = len(reminders)
+    
+    if reminder_count > 0:
+        bulk_send(
+            send_commitment_reminder.chunks(reminders, REMINDER_CHUNK_SIZE).group().tasks
+        )
+        
+        # Mark as reminded (cache for 30 minutes to avoid spam)
+        cache.set_many(
+            {cache_keys[commitment_id]: True for commitment_id, _ in reminders},
+            timeout=30 * 60
+        )
     
     return f"Sent {reminder_count} reminders"
 
@@ -156,11 +167,10 @@ def send_commitment_reminder(self, commitment_id: int, is_final_warning: bool =
     user = commitment.task.user
     time_left = commitment.task.due_date - timezone.now()
     
-    # Format time remaining
-    if time_left.seconds < 3600:
-        time_str = f"{time_left.seconds // 60} minutes"
-    else:
-        time_str = f"{time_left.seconds // 3600} hours"
+    # Format time remaining (total_seconds, not .seconds, which drops days)
+    hours, remainder = divmod(max(int(time_left.total_seconds()), 0), 3600)
+    minutes = remainder // 60
+    time_str = f"{hours}h {minutes}m" if hours else f"{minutes} minutes"
     
     subject = f"⏰ {'FINAL WARNING: ' if is_final_warning else ''}{time_str} left for: {commitment.title}"
     
@@ -233,9 +243,8 @@ def process_evidence_file(self, commitment_id: int):
     Process uploaded evidence file (compress, generate thumbnail, etc.)
     
     This task handles:
-    - Video compression for timelapse evidence
-    - Image optimization
-    - Thumbnail generation
+    - Video compression for timelapse evidence (ffmpeg)
+    - Image downscaling and optimization (Pillow)
     """
     from .models import Commitment
     
@@ -247,13 +256,39 @@ def process_evidence_file(self, commitment_id: int):
     if not commitment.evidence_file:
         return "No evidence file to process"
     
-    file_path = commitment.evidence_file.path
-    
-    # TODO: Implement actual file processing
-    # - For images: Resize, compress, generate thumbnail
-    # - For videos: Compress, extract frame for thumbnail
+    evidence_file = commitment.evidence_file
+    original_name = evidence_file.name
+    # A retry after the row was updated finds the processed file
+    if is_processed(original_name):
+        return f"Evidence for commitment {commitment_id} already processed"
     
-    logger.info(f"Processing evidence file for commitment {commitment_id}: {file_path}")
+    # CPU-bound work runs in Pillow / ffmpeg, not Python; route this task
+    # to the 'media' queue (see CELERY_TASK_ROUTES)
+    try:
+        kind = process_evidence(evidence_file)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.error(f"Failed to process evidence for commitment {commitment_id}: {e}")
+        raise self.retry(exc=e)
+    
+    if kind is None:
+        return f"Skipped evidence for commitment {commitment_id}"
+    
+    if evidence_file.name != original_name:
+        storage = evidence_file.storage
+        with transaction.atomic():
+            # Only swap in the result if the evidence was not resubmitted
+            # while it was processed
+            updated = Commitment.objects.filter(
+                id=commitment_id, evidence_file=original_name
+            ).update(evidence_file=evidence_file.name)
+            # Delete whichever file the row no longer references, once
+            # that is committed
+            unused_name = original_name if updated else evidence_file.name
+            transaction.on_commit(lambda: storage.delete(unused_name), robust=True)
+        if not updated:
+            return f"Evidence for commitment {commitment_id} changed while processing"
+    
+    logger.info(f"Processed {kind} evidence for commitment {commitment_id}: {evidence_file.name}")
     
     return f"Processed evidence for commitment {commitment_id}"
 
@@ -267,8 +302,7 @@ def invalidate_dashboard_cache():
     """
     Invalidate cached dashboard stats after bulk operations.
     """
-    # Get all keys matching dashboard pattern
-    cache.delete_pattern('ticktick:commitment_dashboard_*')
+    bump_dashboard_version()
     logger.info("Invalidated dashboard cache")
     return "Cache invalidated"
 
@@ -280,34 +314,13 @@ def warm_dashboard_cache(user_id: int):
     Called after significant changes to speed up next dashboard load.
     """
     from .models import Commitment
-    from django.db.models import Sum, Count
-    from decimal import Decimal
-    
-    cache_key = f"commitment_dashboard_{user_id}"
-    
-    queryset = Commitment.objects.filter(task__user_id=user_id)
-    
-    active_count = queryset.filter(status='active').count()
-    completed_count = queryset.filter(status='completed').count()
-    failed_count = queryset.filter(status='failed').count()
-    
-    stakes_at_risk = queryset.filter(
-        status='active',
-        stake_type='money'
-    ).aggregate(total=Sum('stake_amount'))['total'] or Decimal('0.00')
     
-    total_resolved = completed_count + failed_count
-    success_rate = (completed_count / total_resolved * 100) if total_resolved > 0 else 0
+    cache_key = dashboard_cache_key(user_id)
     
-    stats = {
-        'active_count': active_count,
-        'completed_count': completed_count,
-        'failed_count': failed_count,
-        'total_stakes_at_risk': str(stakes_at_risk),
-        'success_rate': round(success_rate, 1)
-    }
+    stats = Commitment.objects.filter(task__user_id=user_id).dashboard_stats()
+    stats['total_stakes_at_risk'] = str(stats['total_stakes_at_risk'])
     
-    cache.set(cache_key, stats, timeout=300)  # 5 minutes
+    set_tagged(cache_key, stats, tags={user_commitments_tag(user_id)}, timeout=300)  # 5 minutes
     logger.info(f"Warmed dashboard cache for user {user_id}")
     
     return stats
@@ -0,0 +1,44 @@
+"""
+Tests for Commitments app.
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.tasks.models import Task
+from .models import Commitment
+from .serializers import CommitmentSerializer
+
+User = get_user_model()
+
+
+class CommitmentSerializerTest(TestCase):
+    """Test CommitmentSerializer with its nested TaskSerializer."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser')
+        self.parent = Task.add_root(user=self.user, title='Parent')
+        self.subtask = self.parent.add_child(user=self.user, title='Subtask')
+        self.commitment = Commitment.objects.create(task=self.subtask)
+
+    def test_commitment_on_subtask(self):
+        """Test the nested task of a single commitment reports its parent."""
+        data = CommitmentSerializer(self.commitment).data
+
+        self.assertEqual(data['task']['parent'], self.parent.id)
+
+    def test_commitment_list_on_subtasks(self):
+        """Test each commitment in a list reports its own task's parent."""
+        other_parent = Task.add_root(user=self.user, title='Other parent')
+        other_subtask = other_parent.add_child(user=self.user, title='Other subtask')
+        Commitment.objects.create(task=other_subtask)
+        queryset = CommitmentSerializer.setup_eager_loading(
+            Commitment.objects.filter(task__user=self.user).order_by('task__path')
+        )
+
+        data = CommitmentSerializer(queryset, many=True).data
+
+        self.assertEqual(
+            [item['task']['parent'] for item in data],
+            [self.parent.id, other_parent.id]
+        )
@@ -0,0 +1,40 @@
+"""
+Validators for Commitments App.
+"""
+
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.validators import FileExtensionValidator
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class FrozenFileExtensionValidator(FileExtensionValidator):
+    """
+    FileExtensionValidator backed by a frozenset.
+    
+    The allowed extensions are lowercased once at construction, so each
+    upload is checked with a single hash lookup.
+    """
+    
+    def __init__(self, allowed_extensions=None, message=None, code=None):
+        super().__init__(allowed_extensions, message, code)
+        if self.allowed_extensions is not None:
+            self._allowed_display = ', '.join(self.allowed_extensions)
+            self.allowed_extensions = frozenset(self.allowed_extensions)
+    
+    def __call__(self, value):
+        if self.allowed_extensions is None:
+            return
+        extension = Path(value.name).suffix[1:].lower()
+        if extension not in self.allowed_extensions:
+            raise ValidationError(
+                self.message,
+                code=self.code,
+                params={
+                    'extension': extension,
+                    'allowed_extensions': self._allowed_display,
+                    'value': value,
+                },
+            )
@@ -10,11 +10,11 @@ Provides REST API endpoints for:
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Sum, Count, Q
-from django.utils import timezone
-from decimal import Decimal
+from drf_spectacular.utils import extend_schema
+from django.core.cache import cache
 import logging
 
+from .cache import dashboard_cache_key, set_tagged, user_commitments_tag
 from .models import Commitment, Complaint, EvidenceVerification, CommitmentAttachment
 from .serializers import (
     CommitmentSerializer,
@@ -27,6 +27,9 @@ from .serializers import (
 
 logger = logging.getLogger(__name__)
 
+# Seconds a computed dashboard response is served from cache
+DASHBOARD_CACHE_TIMEOUT = 60
+
 
 class CommitmentViewSet(viewsets.ModelViewSet):
     """
@@ -48,9 +51,12 @@ class CommitmentViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Commitment.objects.filter(
+        queryset = Commitment.objects.filter(
             task__user=self.request.user
-        ).select_related('task', 'task__list').order_by('-created_at')
+        ).order_by('-created_at')
+        if self.action == 'list':
+            return CommitmentListSerializer.setup_eager_loading(queryset)
+        return CommitmentSerializer.setup_eager_loading(queryset)
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -75,44 +81,30 @@ class CommitmentViewSet(viewsets.ModelViewSet):
             logger.error(f"Error creating commitment: {str(e)}", exc_info=True)
             raise
     
+    @extend_schema(responses=CommitmentDashboardSerializer)
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
-        """Get dashboard statistics for commitments."""
-        queryset = self.get_queryset()
-        
-        # Count by status
-        active_count = queryset.filter(status='active').count()
-        completed_count = queryset.filter(status='completed').count()
-        failed_count = queryset.filter(status='failed').count()
-        
-        # Total money at risk (active commitments with money stakes)
-        stakes_at_risk = queryset.filter(
-            status='active',
-            stake_type='money'
-        ).aggregate(total=Sum('stake_amount'))['total'] or Decimal('0.00')
-        
-        # Pending evidence count
-        pending_evidence = queryset.filter(
-            status='active',
-            evidence_required=True,
-            evidence_submitted=False
-        ).count()
+        """
+        Get dashboard statistics for commitments.
         
-        # Success rate
-        total_resolved = completed_count + failed_count
-        success_rate = (completed_count / total_resolved * 100) if total_resolved > 0 else 0
+        Served from cache when warm; the entry is dropped by tag whenever
+        one of the user's commitments is saved.
+        """
+        cache_key = dashboard_cache_key(request.user.id)
+        data = cache.get(cache_key)
         
-        data = {
-            'active_count': active_count,
-            'completed_count': completed_count,
-            'failed_count': failed_count,
-            'total_stakes_at_risk': stakes_at_risk,
-            'pending_evidence_count': pending_evidence,
-            'success_rate': round(success_rate, 1)
-        }
+        if data is None:
+            data = Commitment.objects.filter(task__user=request.user).dashboard_stats()
+            # Plain scalars: no serializer walk needed, only the Decimal
+            # is stringified to match the documented schema
+            data['total_stakes_at_risk'] = str(data['total_stakes_at_risk'])
+            set_tagged(
+                cache_key, data,
+                tags={user_commitments_tag(request.user.id)},
+                timeout=DASHBOARD_CACHE_TIMEOUT
+            )
         
-        serializer = CommitmentDashboardSerializer(data)
-        return Response(serializer.data)
+        return Response(data)
     
     @action(detail=True, methods=['post'])
     def activate(self, request, pk=None):
@@ -124,6 +116,17 @@ class CommitmentViewSet(viewsets.ModelViewSet):
         except ValueError as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=True, methods=['get'])
+    def evidence_upload(self, request, pk=None):
+        """
+        Storage prefix to upload evidence under before submit_evidence.
+        
+        Files stored under this prefix can be submitted by key
+        (evidence_key) instead of being posted as evidence_file.
+        """
+        commitment = self.get_object()
+        return Response({'key_prefix': commitment.evidence_upload_prefix})
+    
     @action(detail=True, methods=['post'])
     def submit_evidence(self, request, pk=None):
         """Submit evidence for a commitment."""
@@ -131,13 +134,15 @@ class CommitmentViewSet(viewsets.ModelViewSet):
         
         evidence_type = request.data.get('evidence_type')
         evidence_file = request.FILES.get('evidence_file')
+        evidence_key = request.data.get('evidence_key')
         evidence_text = request.data.get('evidence_text', '')
         
         try:
             commitment.submit_evidence(
                 evidence_type=evidence_type,
                 evidence_file=evidence_file,
-                evidence_text=evidence_text
+                evidence_text=evidence_text,
+                evidence_key=evidence_key
             )
             return Response(CommitmentSerializer(commitment, context={'request': request}).data)
         except ValueError as e:
@@ -202,9 +207,10 @@ class ComplaintViewSet(viewsets.ModelViewSet):
     serializer_class = ComplaintSerializer
     
     def get_queryset(self):
-        return Complaint.objects.filter(
+        queryset = Complaint.objects.filter(
             user=self.request.user
-        ).select_related('commitment', 'commitment__task').order_by('-created_at')
+        ).order_by('-created_at')
+        return ComplaintSerializer.setup_eager_loading(queryset)
 
 
 class EvidenceVerificationViewSet(viewsets.ReadOnlyModelViewSet):
@@ -217,9 +223,10 @@ class EvidenceVerificationViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = EvidenceVerificationSerializer
     
     def get_queryset(self):
-        return EvidenceVerification.objects.filter(
+        queryset = EvidenceVerification.objects.filter(
             commitment__task__user=self.request.user
-        ).select_related('commitment', 'commitment__task').order_by('-created_at')
+        ).order_by('-created_at')
+        return EvidenceVerificationSerializer.setup_eager_loading(queryset)
 
 
 class CommitmentAttachmentViewSet(viewsets.ModelViewSet):
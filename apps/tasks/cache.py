@@ -0,0 +1,77 @@
+"""
+Cache helpers for Tasks App.
+
+Usage:
+    from apps.tasks.cache import calendar_cache_key, bump_calendar_version_on_commit
+    
+    key = calendar_cache_key(user.id, start_date, end_date)
+    bump_calendar_version_on_commit(user.id)  # after any change to the user's tasks
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+# Serialized calendar payloads are reused for a few minutes at most
+CALENDAR_CACHE_TIMEOUT = 300
+
+# Larger payloads are streamed without being cached
+CALENDAR_CACHE_MAX_BYTES = 1024 * 1024
+
+# Fallback for settings.ATTACHMENT_URL_CACHE_TTL
+ATTACHMENT_URL_CACHE_TIMEOUT = 50 * 60
+
+
+def _calendar_version_key(user_id):
+    return f"calendar_version_{user_id}"
+
+
+def calendar_cache_key(user_id, start_date, end_date):
+    """
+    Cache key for a user's calendar payload over a window.
+    
+    Includes the user's calendar version, so every cached window of the
+    user is invalidated at once by bump_calendar_version().
+    """
+    version = cache.get(_calendar_version_key(user_id), 0)
+    return f"calendar_v{version}_{user_id}_{start_date.timestamp()}_{end_date.timestamp()}"
+
+
+def bump_calendar_version(user_id):
+    """Invalidate all of a user's cached calendar payloads with one INCR."""
+    key = _calendar_version_key(user_id)
+    cache.add(key, 0, timeout=None)
+    return cache.incr(key)
+
+
+def bump_calendar_version_on_commit(user_id):
+    """
+    bump_calendar_version() once the current transaction commits.
+    
+    Bumping earlier would let a concurrent calendar request cache
+    pre-commit rows under the new version. robust=True logs cache errors
+    instead of raising them, since the task write itself has succeeded.
+    """
+    transaction.on_commit(lambda: bump_calendar_version(user_id), robust=True)
+
+
+def attachment_url_cache_key(attachment_id):
+    return f"attachment_url_{attachment_id}"
+
+
+def cache_attachment_urls(urls):
+    """
+    Store generated storage URLs of attachments.
+    
+    Lifetime is settings.ATTACHMENT_URL_CACHE_TTL; keep it below the
+    storage's signed URL expiry.
+    
+    Args:
+        urls: Dict mapping attachment id to its URL
+    """
+    timeout = getattr(settings, 'ATTACHMENT_URL_CACHE_TTL', ATTACHMENT_URL_CACHE_TIMEOUT)
+    cache.set_many(
+        {attachment_url_cache_key(pk): url for pk, url in urls.items()},
+        timeout=timeout,
+    )
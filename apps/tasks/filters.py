@@ -0,0 +1,30 @@
+"""
+Filter backends for Task Management API.
+"""
+
+from django.contrib.postgres.search import SearchQuery
+from rest_framework.filters import SearchFilter
+
+
+class TaskSearchFilter(SearchFilter):
+    """
+    ?search= backed by Task.search_vector instead of icontains.
+    
+    Matches stemmed words in title and notes through the single GIN index
+    on search_vector, rather than OR-ing substring scans over each column.
+    Supports web-search syntax: quoted phrases, 'or' and '-term'.
+    """
+    
+    search_config = 'english'
+    
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        
+        query = SearchQuery(
+            ' '.join(search_terms),
+            config=self.search_config,
+            search_type='websearch'
+        )
+        return queryset.filter(search_vector=query)
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-16 14:05
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0002_taskattachment"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_title_gin_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_notes_gin_idx",
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("title"),
+                    name="gin_trgm_ops",
+                ),
+                name="task_title_upper_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("notes"),
+                    name="gin_trgm_ops",
+                ),
+                name="task_notes_upper_trgm_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-16 15:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0004_task_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="occurrences_until",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name="RecurrenceOccurrence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("occurs_at", models.DateTimeField()),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occurrences",
+                        to="tasks.task",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "task_occurrences",
+                "ordering": ["occurs_at"],
+                "unique_together": {("task", "occurs_at")},
+            },
+        ),
+    ]
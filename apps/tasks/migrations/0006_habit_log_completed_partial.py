@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-16 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0005_recurrenceoccurrence_task_occurrences_until"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="habitlog",
+            name="habit_log_completed_idx",
+        ),
+        migrations.AddIndex(
+            model_name="habitlog",
+            index=models.Index(
+                condition=models.Q(("completed", True)),
+                fields=["habit", "-date"],
+                name="habit_log_completed_partial",
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-16 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0006_habit_log_completed_partial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_user_due_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_user_status_idx",
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "due_date"],
+                include=("title", "status", "priority", "list", "kanban_order"),
+                name="task_user_due_cov_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "status"],
+                include=("title", "due_date", "priority", "list", "kanban_order"),
+                name="task_user_status_cov_idx",
+            ),
+        ),
+        # Fresh statistics so the planner considers the new indexes.
+        # Index-only scans also need an up-to-date visibility map; that is
+        # left to autovacuum (or a manual `VACUUM tasks;` outside the
+        # deploy) since VACUUM cannot run in a migration's transaction.
+        migrations.RunSQL(
+            sql="ANALYZE tasks;",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0007_task_covering_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskattachment",
+            name="file_url_cache",
+            field=models.CharField(blank=True, editable=False, max_length=1024),
+        ),
+        migrations.AddField(
+            model_name="taskattachment",
+            name="file_url_expires_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:45
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0008_taskattachment_file_url_cache"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["created_at"], name="task_created_brin", pages_per_range=32
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="habitlog",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["date"], name="habitlog_date_brin"
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:15
+
+from django.db import migrations
+
+# Same rules Task.save() used to apply in Python: completing a task stamps
+# completed_at (unless one was given), any other status clears it
+CREATE_TRIGGER_SQL = """
+CREATE FUNCTION tasks_set_completed_at() RETURNS trigger AS $$
+BEGIN
+    IF NEW.status = 'COMPLETED' THEN
+        NEW.completed_at := coalesce(NEW.completed_at, now());
+    ELSE
+        NEW.completed_at := NULL;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_set_completed_at_trigger
+    BEFORE INSERT OR UPDATE OF status, completed_at ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_set_completed_at();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS tasks_set_completed_at_trigger ON tasks;
+DROP FUNCTION IF EXISTS tasks_set_completed_at();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0009_task_created_brin_habitlog_date_brin"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0010_task_completed_at_trigger"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_priority_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_status_idx",
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:05
+
+from django.db import migrations, models
+
+# Keeps notes_preview equal to the first 200 characters of notes, also
+# for queryset .update(notes=...) calls that bypass Task.save()
+CREATE_TRIGGER_SQL = """
+CREATE FUNCTION tasks_notes_preview_update() RETURNS trigger AS $$
+BEGIN
+    NEW.notes_preview := left(NEW.notes, 200);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_notes_preview_trigger
+    BEFORE INSERT OR UPDATE OF notes ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_notes_preview_update();
+
+UPDATE tasks SET notes_preview = left(notes, 200) WHERE notes <> '';
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS tasks_notes_preview_trigger ON tasks;
+DROP FUNCTION IF EXISTS tasks_notes_preview_update();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0011_remove_task_priority_status_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="notes_preview",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=200
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:10
+
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def backfill_next_occurrence(apps, schema_editor):
+    """Store the occurrence after due_date for existing recurring tasks."""
+    Task = apps.get_model("tasks", "Task")
+    recurring = Task.objects.filter(
+        recurrence__isnull=False, due_date__isnull=False
+    ).exclude(recurrence="").only("id", "recurrence", "due_date")
+
+    batch = []
+    for task in recurring.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        task.next_occurrence = task.recurrence.after(
+            task.due_date, inc=False, dtstart=task.due_date
+        )
+        batch.append(task)
+        if len(batch) == BACKFILL_BATCH_SIZE:
+            Task.objects.bulk_update(batch, ["next_occurrence"])
+            batch = []
+    if batch:
+        Task.objects.bulk_update(batch, ["next_occurrence"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0012_task_notes_preview"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="next_occurrence",
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(backfill_next_occurrence, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0013_task_next_occurrence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HabitStreak",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("current_streak", models.PositiveIntegerField(default=0)),
+                ("longest_streak", models.PositiveIntegerField(default=0)),
+                (
+                    "streak_until",
+                    models.DateField(help_text="Last day covered by the snapshot"),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "habit",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="streak",
+                        to="tasks.habit",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "habit_streaks",
+            },
+        ),
+    ]
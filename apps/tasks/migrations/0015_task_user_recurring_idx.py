@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0014_habitstreak"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(
+                    ("recurrence__isnull", False), models.Q(("recurrence", ""), _negated=True)
+                ),
+                fields=["user", "due_date"],
+                name="task_user_recurring_idx",
+            ),
+        ),
+    ]
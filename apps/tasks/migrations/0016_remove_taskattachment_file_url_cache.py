@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:55
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0015_task_user_recurring_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="taskattachment",
+            name="file_url_cache",
+        ),
+        migrations.RemoveField(
+            model_name="taskattachment",
+            name="file_url_expires_at",
+        ),
+    ]
@@ -6,7 +6,7 @@ This module implements production-ready task management with:
 - Smart recurrence using RFC 5545 RRULE strings via django-recurrence
 - Lists and Tags for organization
 - Habits and HabitLog for daily tracking
-- PostgreSQL optimizations (GinIndex, BTreeIndex)
+- PostgreSQL optimizations (GinIndex, BTreeIndex, tsvector search)
 
 Third-party packages required:
 - django-treebeard: For tree structure (infinite subtasks)
@@ -14,13 +14,38 @@ Third-party packages required:
 - psycopg2-binary: PostgreSQL adapter
 """
 
-from django.db import models
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import models, transaction
 from django.conf import settings
-from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.cache import cache
 from django.core.validators import MinValueValidator, MaxValueValidator
 from treebeard.mp_tree import MP_Node
+from recurrence import serialize as serialize_recurrence
 from recurrence.fields import RecurrenceField
 
+from .cache import (
+    attachment_url_cache_key,
+    bump_calendar_version_on_commit,
+    cache_attachment_urls,
+)
+
+
+# Characters of Task.notes copied into Task.notes_preview
+NOTES_PREVIEW_LENGTH = 200
+
+# Task.occurrences_until value for recurring tasks whose occurrences
+# cannot be stored (none in the horizon, or too many); they are expanded
+# on the fly and skipped by the nightly refresh until the schedule changes
+OCCURRENCES_NOT_MATERIALIZED = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# Pre-built indents for Task.__str__, indexed by depth - 1
+MAX_INDENT_DEPTH = 32
+_INDENTS = tuple('  ' * level for level in range(MAX_INDENT_DEPTH))
+
 
 class List(models.Model):
     """
@@ -149,6 +174,14 @@ class Task(MP_Node):
         blank=True,
         help_text='Rich text notes/description for the task'
     )
+    # Inline prefix of notes, read instead of notes by the flat task tree;
+    # kept in sync by save() and the tasks_notes_preview trigger
+    notes_preview = models.CharField(
+        max_length=NOTES_PREVIEW_LENGTH,
+        blank=True,
+        default='',
+        editable=False
+    )
     
     # Organization
     list = models.ForeignKey(
@@ -213,6 +246,19 @@ class Task(MP_Node):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # End of the window covered by materialized RecurrenceOccurrence rows
+    # (null = not materialized yet, OCCURRENCES_NOT_MATERIALIZED = cannot
+    # be; both expand the RRULE on the fly)
+    occurrences_until = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    # Occurrence after due_date (the due date completing the task moves to);
+    # recomputed by save() when the schedule changes
+    next_occurrence = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+    
+    # Full-text search (title weighted A, notes B); maintained by a
+    # database trigger, see migration 0004_task_search_vector
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     # Treebeard configuration
     node_order_by = ['kanban_order']
     
@@ -220,70 +266,149 @@ class Task(MP_Node):
         db_table = 'tasks'
         ordering = ['kanban_order', 'created_at']
         indexes = [
-            # Full-text search indexes using PostgreSQL GinIndex
-            GinIndex(
-                fields=['title'],
-                name='task_title_gin_idx',
-                opclasses=['gin_trgm_ops']
-            ),
-            GinIndex(
-                fields=['notes'],
-                name='task_notes_gin_idx',
-                opclasses=['gin_trgm_ops']
-            ),
+            # Full-text search index using PostgreSQL GinIndex
+            GinIndex(fields=['search_vector'], name='task_search_vector_idx'),
             
-            # Performance indexes for common queries
+            # Cross-user due date scans (commitment overdue/reminder jobs);
+            # per-user status/priority filters use the composites below
             models.Index(fields=['due_date'], name='task_due_date_idx'),
-            models.Index(fields=['priority'], name='task_priority_idx'),
-            models.Index(fields=['status'], name='task_status_idx'),
             
-            # Composite indexes for filtered queries
+            # Composite indexes for filtered queries; the INCLUDE columns
+            # let list/board reads use index-only scans
             models.Index(
                 fields=['user', 'due_date'],
-                name='task_user_due_idx'
+                include=['title', 'status', 'priority', 'list', 'kanban_order'],
+                name='task_user_due_cov_idx'
             ),
             models.Index(
                 fields=['user', 'status'],
-                name='task_user_status_idx'
+                include=['title', 'due_date', 'priority', 'list', 'kanban_order'],
+                name='task_user_status_cov_idx'
             ),
             models.Index(
                 fields=['user', 'list', 'kanban_order'],
                 name='task_user_list_order_idx'
             ),
+            # Calendar reads of recurring tasks (due_date <= window end);
+            # partial, so it stays as small as the user's recurring set
+            models.Index(
+                fields=['user', 'due_date'],
+                name='task_user_recurring_idx',
+                condition=models.Q(recurrence__isnull=False) & ~models.Q(recurrence='')
+            ),
             
             # Index for tree queries (treebeard uses path field)
             models.Index(fields=['path'], name='task_path_idx'),
+            
+            # Rows are appended in created_at order, so per-range min/max
+            # is enough for time-window scans at a fraction of a B-tree
+            BrinIndex(fields=['created_at'], name='task_created_brin', pages_per_range=32),
         ]
     
     def __str__(self):
-        indent = '  ' * (self.depth - 1) if self.depth > 1 else ''
+        level = self.depth - 1 if self.depth > 1 else 0
+        indent = _INDENTS[level] if level < MAX_INDENT_DEPTH else '  ' * level
         return f"{indent}{self.title}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'recurrence' in field_names and 'due_date' in field_names:
+            instance._loaded_schedule = instance._schedule_key()
+        if 'title' in field_names:
+            # Lets the commitment title sync skip saves that keep the title
+            instance._loaded_title = instance.title
+        return instance
+    
+    def _schedule_key(self):
+        """Inputs that determine materialized occurrences (None if not recurring)."""
+        if self.recurrence is None:
+            return None
+        return (serialize_recurrence(self.recurrence), self.due_date)
+    
     def save(self, *args, **kwargs):
-        """Override save to handle status changes and completion tracking."""
-        # Update completed_at when status changes to COMPLETED
-        if self.status == self.STATUS_COMPLETED and not self.completed_at:
-            from django.utils import timezone
-            self.completed_at = timezone.now()
-        elif self.status != self.STATUS_COMPLETED:
-            self.completed_at = None
+        """
+        Override save to handle recurrence materialization.
+        
+        completed_at is maintained by the tasks_set_completed_at database
+        trigger (migration 0010), so queryset .update(status=...) keeps it
+        right too; it is re-read here only when the trigger changed it.
+        """
+        # Mirrors the tasks_notes_preview trigger so the instance is current
+        self.notes_preview = self.notes[:NOTES_PREVIEW_LENGTH]
+        
+        # Stop trusting materialized occurrences once the RRULE or its
+        # start moves; they are rebuilt in the background after commit
+        schedule = self._schedule_key()
+        schedule_changed = schedule != getattr(self, '_loaded_schedule', None)
+        if schedule_changed:
+            from .services import RecurrenceService
+            self.__dict__.pop('_compiled_rrules', None)
+            self.occurrences_until = None
+            self.next_occurrence = (
+                RecurrenceService.get_next_occurrence(self, after=self.due_date)
+                if schedule is not None and self.due_date else None
+            )
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'occurrences_until', 'next_occurrence'}
         
         super().save(*args, **kwargs)
+        
+        if (self.status == self.STATUS_COMPLETED) != (self.completed_at is not None):
+            self.refresh_from_db(fields=['completed_at'])
+        
+        if schedule_changed:
+            from .tasks import materialize_task_occurrences
+            task_id = self.pk
+            transaction.on_commit(lambda: materialize_task_occurrences.delay(task_id))
+            self._loaded_schedule = schedule
+        
+        bump_calendar_version_on_commit(self.user_id)
+    
+    def delete(self, *args, **kwargs):
+        """Delete the task (and its subtasks) and invalidate cached calendars."""
+        user_id = self.user_id
+        result = super().delete(*args, **kwargs)
+        bump_calendar_version_on_commit(user_id)
+        return result
     
     @property
     def is_recurring(self):
         """Check if task has recurrence rule."""
         return self.recurrence is not None
     
+    def compiled_rrule(self, dtstart):
+        """
+        dateutil rruleset for the task's recurrence starting at dtstart.
+        
+        django-recurrence rebuilds the dateutil objects on every
+        between()/after() call; here they are built once per instance and
+        dtstart (with dateutil's occurrence cache on), so repeated
+        expansions of the same task reuse them. Dropped by save() when
+        the schedule changes.
+        """
+        compiled = self.__dict__.setdefault('_compiled_rrules', {})
+        if dtstart not in compiled:
+            compiled[dtstart] = self.recurrence.to_dateutil_rruleset(dtstart=dtstart, cache=True)
+        return compiled[dtstart]
+    
+    @property
+    def parent_path(self):
+        """Materialized path of the parent node (None for root tasks)."""
+        if self.depth <= 1:
+            return None
+        return self.path[:-TASK_STEPLEN]
+    
     @property
     def has_subtasks(self):
         """Check if task has children."""
-        return self.get_children().exists()
+        return self.numchild > 0
     
     @property
     def subtask_count(self):
-        """Get number of direct children."""
-        return self.get_children().count()
+        """Get number of direct children (numchild is maintained by treebeard)."""
+        return self.numchild
     
     @property
     def all_subtasks_count(self):
@@ -291,6 +416,35 @@ class Task(MP_Node):
         return self.get_descendants().count()
 
 
+# Width of one treebeard path segment; cached so per-row path slicing
+# does not go through the class attribute lookup
+TASK_STEPLEN = Task.steplen
+
+
+class RecurrenceOccurrence(models.Model):
+    """
+    Materialized occurrence of a recurring task.
+    
+    Filled by RecurrenceService.materialize_occurrences() up to
+    Task.occurrences_until, so calendar queries become an index range scan
+    instead of evaluating the RRULE on every request.
+    """
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='occurrences'
+    )
+    occurs_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'task_occurrences'
+        ordering = ['occurs_at']
+        unique_together = [['task', 'occurs_at']]
+    
+    def __str__(self):
+        return f"{self.task.title} @ {self.occurs_at:%Y-%m-%d %H:%M}"
+
+
 class Habit(models.Model):
     """
     Habit model for daily/weekly habit tracking.
@@ -369,6 +523,37 @@ class Habit(models.Model):
         return f"{self.user.username} - {self.name}"
 
 
+class HabitStreak(models.Model):
+    """
+    Nightly snapshot of a daily habit's streaks.
+    
+    Filled for every daily habit in one query by
+    HabitService.refresh_habit_streaks(). current_streak is the run of
+    completed days ending on streak_until (the day before the refresh),
+    so today's log is added on read. Writing a log before today deletes
+    the row (see HabitLog.touch_habit), and rows that still disagree with
+    the latest completed log up to streak_until are ignored.
+    """
+    habit = models.OneToOneField(
+        Habit,
+        on_delete=models.CASCADE,
+        related_name='streak'
+    )
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    streak_until = models.DateField(
+        help_text='Last day covered by the snapshot'
+    )
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'habit_streaks'
+    
+    def __str__(self):
+        return f"{self.habit.name} - {self.current_streak} day streak"
+
+
 class HabitLog(models.Model):
     """
     HabitLog model for tracking daily habit completions.
@@ -400,19 +585,93 @@ class HabitLog(models.Model):
         unique_together = [['habit', 'date']]
         indexes = [
             models.Index(fields=['habit', 'date'], name='habit_log_date_idx'),
-            models.Index(fields=['habit', 'completed'], name='habit_log_completed_idx'),
+            # Streak and completion-rate scans only read completed logs,
+            # newest first
+            models.Index(
+                fields=['habit', '-date'],
+                name='habit_log_completed_partial',
+                condition=models.Q(completed=True)
+            ),
+            # Logs are written day by day, so date follows insert order
+            BrinIndex(fields=['date'], name='habitlog_date_brin'),
         ]
     
+    def save(self, *args, **kwargs):
+        """Save the log and bump the habit's updated_at (invalidates cached stats)."""
+        super().save(*args, **kwargs)
+        self.touch_habit()
+    
+    def delete(self, *args, **kwargs):
+        """Delete the log and bump the habit's updated_at (invalidates cached stats)."""
+        result = super().delete(*args, **kwargs)
+        self.touch_habit()
+        return result
+    
+    def touch_habit(self):
+        """
+        Set habit.updated_at to now with a single UPDATE.
+        
+        Cached streak/completion_rate values are keyed on it, see
+        HabitService.get_cached_habit_stat. A log before today also
+        changes days the nightly HabitStreak covers, so that snapshot is
+        dropped until the next refresh. Bulk queryset writes skip
+        save()/delete() and must call this themselves.
+        """
+        from django.utils import timezone
+        now = timezone.now()
+        Habit.objects.filter(pk=self.habit_id).update(updated_at=now)
+        if self.date < now.date():
+            HabitStreak.objects.filter(habit_id=self.habit_id).delete()
+    
     def __str__(self):
         status = '✓' if self.completed else '✗'
         return f"{self.habit.name} - {self.date} [{status}]"
 
 
+# Threads used to overlap remote storage round-trips in bulk uploads
+ATTACHMENT_IO_WORKERS = 8
+
+
 def task_attachment_path(instance, filename):
     """Generate upload path for task attachments."""
     return f'task_attachments/{instance.task.id}/{filename}'
 
 
+class TaskAttachmentQuerySet(models.QuerySet):
+    """Custom QuerySet for TaskAttachment."""
+    
+    def bulk_create_with_metadata(self, attachments, max_workers=ATTACHMENT_IO_WORKERS):
+        """
+        Store files, fill metadata and insert many attachments at once.
+        
+        Per-file storage work (upload, size lookup for already-stored
+        files, URL generation) is a network round-trip on remote
+        storages, so it runs in a thread pool; the rows are then written
+        with one bulk_create(). save() is not called.
+        
+        Args:
+            attachments: Unsaved TaskAttachment instances with task and file set
+            max_workers: Upper bound on concurrent storage calls
+            
+        Returns:
+            The created attachments
+        """
+        attachments = list(attachments)
+        if not attachments:
+            return []
+        
+        workers = min(max_workers, len(attachments))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(TaskAttachment.prepare_file, attachments))
+        
+        created = self.bulk_create(attachments)
+        cache_attachment_urls({
+            attachment.pk: attachment._file_url
+            for attachment in created if attachment.pk
+        })
+        return created
+
+
 class TaskAttachment(models.Model):
     """
     Model for storing file attachments for tasks.
@@ -449,6 +708,8 @@ class TaskAttachment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TaskAttachmentQuerySet.as_manager()
+    
     class Meta:
         db_table = 'task_attachments'
         ordering = ['-created_at']
@@ -466,6 +727,46 @@ class TaskAttachment(models.Model):
         if self.file and not self.file_size:
             self.file_size = self.file.size
         super().save(*args, **kwargs)
+        
+        # The final storage name is only known once the file is saved
+        if self.file:
+            cache_attachment_urls({self.pk: self.file.url})
+    
+    def cached_file_url(self):
+        """
+        Storage URL of the file, reused from the cache until it expires.
+        
+        storage.url() signs every URL on S3 (an HMAC per call), so the
+        result is kept in the cache backend rather than regenerated on
+        each read; see apps.tasks.cache.cache_attachment_urls().
+        
+        Returns:
+            URL string, or None if there is no file
+        """
+        if not self.file:
+            return None
+        
+        url = cache.get(attachment_url_cache_key(self.pk))
+        if url is None:
+            url = self.file.url
+            cache_attachment_urls({self.pk: url})
+        return url
+    
+    def prepare_file(self):
+        """
+        Upload the file if needed and fill metadata without saving the row.
+        
+        Used by TaskAttachmentQuerySet.bulk_create_with_metadata(). The size
+        of a fresh upload is read locally before it is stored; only files
+        already in storage need storage.size().
+        """
+        if not self.file_size:
+            self.file_size = self.file.size
+        if not self.file._committed:
+            self.file.save(self.file.name, self.file.file, save=False)
+        if not self.file_name:
+            self.file_name = self.file.name.split('/')[-1]
+        self._file_url = self.file.url
     
     @property
     def is_image(self):
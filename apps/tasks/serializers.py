@@ -7,9 +7,15 @@ This module provides DRF serializers for all models with:
 - Recurrence field serialization
 """
 
+from collections import defaultdict
+from datetime import timedelta
+
 from rest_framework import serializers
 from django.conf import settings
-from .models import List, Tag, Task, Habit, HabitLog, TaskAttachment
+from django.db.models import Prefetch
+from django.utils import timezone
+from recurrence import serialize as serialize_recurrence
+from .models import List, Tag, Task, Habit, HabitLog, TaskAttachment, TASK_STEPLEN
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -38,8 +44,11 @@ class ListSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
     
     def get_task_count(self, obj):
-        """Return number of tasks in this list."""
-        return obj.tasks.count()
+        """Return number of tasks in this list (annotated by the view when listing)."""
+        task_count = getattr(obj, 'task_count', None)
+        if task_count is None:
+            task_count = obj.tasks.count()
+        return task_count
 
 
 class TaskSerializer(serializers.ModelSerializer):
@@ -59,33 +68,73 @@ class TaskSerializer(serializers.ModelSerializer):
     # Treebeard fields
     parent_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
     parent = serializers.SerializerMethodField()
-    children_count = serializers.SerializerMethodField()
-    depth = serializers.IntegerField(read_only=True)
+    # Plain attribute reads: no per-row method dispatch or type coercion
+    children_count = serializers.ReadOnlyField(source='numchild')
+    depth = serializers.ReadOnlyField()
     
     # Recurrence display
-    is_recurring = serializers.BooleanField(read_only=True)
+    is_recurring = serializers.ReadOnlyField()
     
     class Meta:
         model = Task
         fields = [
-            'id', 'title', 'notes', 'status', 'priority',
+            'id', 'title', 'notes', 'notes_preview', 'status', 'priority',
             'due_date', 'start_date', 'duration_minutes',
-            'recurrence', 'is_recurring',
+            'recurrence', 'is_recurring', 'next_occurrence',
             'list', 'list_name', 'tags', 'tag_ids',
             'kanban_order', 'completed_at',
             'parent_id', 'parent', 'children_count', 'depth',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['created_at', 'updated_at', 'completed_at', 'depth']
+        read_only_fields = [
+            'created_at', 'updated_at', 'completed_at', 'depth',
+            'notes_preview', 'next_occurrence'
+        ]
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Join list (for list_name) and prefetch tags in one extra query.
+        search_vector is never rendered, so it is not loaded.
+        """
+        return queryset.select_related('list').prefetch_related('tags').defer('search_vector')
+    
+    @staticmethod
+    def _load_parent_ids(tasks):
+        parent_paths = {task.parent_path for task in tasks if task.depth > 1}
+        return dict(
+            Task.objects.filter(path__in=parent_paths).values_list('path', 'id')
+        )
+    
+    def _parent_ids(self, obj):
+        """
+        Map parent path -> parent id for the tasks being serialized.
+        
+        Under a ListSerializer (many=True) the map covers the whole list,
+        is built with one query the first time a parent is needed and is
+        kept on the list serializer, so serializing N tasks does not run N
+        get_parent() lookups. Otherwise (a single task, or TaskSerializer
+        nested in another serializer) only obj is looked up.
+        """
+        list_serializer = self.parent
+        if not isinstance(list_serializer, serializers.ListSerializer) or list_serializer.instance is None:
+            return self._load_parent_ids([obj])
+        
+        parent_ids = getattr(list_serializer, '_parent_ids', None)
+        if parent_ids is None:
+            parent_ids = self._load_parent_ids(list_serializer.instance)
+            list_serializer._parent_ids = parent_ids
+        return parent_ids
     
     def get_parent(self, obj):
         """Return parent task ID if exists."""
-        parent = obj.get_parent()
-        return parent.id if parent else None
-    
-    def get_children_count(self, obj):
-        """Return number of direct children."""
-        return obj.subtask_count
+        if obj.depth <= 1:
+            return None
+        parent_id = self._parent_ids(obj).get(obj.parent_path)
+        if parent_id is None:
+            parent = obj.get_parent()
+            return parent.id if parent else None
+        return parent_id
     
     def create(self, validated_data):
         """Handle task creation with tree positioning."""
@@ -101,15 +150,147 @@ class TaskSerializer(serializers.ModelSerializer):
             task = Task.add_root(**validated_data)
         
         if tags:
-            task.tags.set(tags)
+            # The task is new, so there are no existing rows to diff
+            # against: insert the links in one statement
+            through = Task.tags.through
+            through.objects.bulk_create(
+                [through(task_id=task.id, tag_id=tag.id) for tag in tags],
+                ignore_conflicts=True
+            )
         
         return task
 
 
+# Columns rendered by fast_task_list(), see task_list_values()
+TASK_LIST_COLUMNS = (
+    'id', 'title', 'notes', 'notes_preview', 'status', 'priority',
+    'due_date', 'start_date', 'duration_minutes', 'recurrence',
+    'next_occurrence', 'list_id', 'list__name', 'kanban_order', 'completed_at',
+    'path', 'depth', 'numchild', 'created_at', 'updated_at',
+)
+
+# flat_task_tree() nodes only show a snippet: reading notes_preview
+# without notes keeps Postgres from detoasting long notes for every node
+TASK_TREE_COLUMNS = tuple(column for column in TASK_LIST_COLUMNS if column != 'notes')
+
+# Shared formatter so fast_task_list() emits the same strings as DRF
+_datetime_field = serializers.DateTimeField()
+
+
+def _format_datetime(value):
+    return None if value is None else _datetime_field.to_representation(value)
+
+
+def task_list_values(queryset, columns=TASK_LIST_COLUMNS):
+    """Trim a Task queryset to the columns TaskSerializer renders, as dicts."""
+    return queryset.prefetch_related(None).values(*columns)
+
+
+def fast_task_list(rows, parent_ids=None):
+    """
+    Render task_list_values() rows as TaskSerializer(many=True) would.
+    
+    Read-only fast path for large task lists: no model instances and no
+    per-field DRF serializer walk. Tags and parent ids are fetched with
+    one query each for the whole batch.
+    
+    Args:
+        rows: task_list_values() rows; 'notes' is omitted from the
+            output when the rows do not select it
+        parent_ids: Optional parent path -> id map; skips the parent query
+            when the rows already contain every parent (e.g. a whole tree)
+    """
+    rows = list(rows)
+    task_ids = [row['id'] for row in rows]
+    
+    tags_by_task = defaultdict(list)
+    if task_ids:
+        tag_rows = Tag.objects.filter(tasks__id__in=task_ids).values(
+            'tasks__id', 'id', 'name', 'color', 'created_at', 'updated_at'
+        )
+        for tag in tag_rows:
+            tags_by_task[tag['tasks__id']].append({
+                'id': tag['id'],
+                'name': tag['name'],
+                'color': tag['color'],
+                'created_at': _format_datetime(tag['created_at']),
+                'updated_at': _format_datetime(tag['updated_at']),
+            })
+    
+    if parent_ids is None:
+        parent_paths = {row['path'][:-TASK_STEPLEN] for row in rows if row['depth'] > 1}
+        parent_ids = {}
+        if parent_paths:
+            parent_ids = dict(Task.objects.filter(path__in=parent_paths).values_list('path', 'id'))
+    
+    data = []
+    for row in rows:
+        recurrence = row['recurrence']
+        if recurrence is not None and not isinstance(recurrence, str):
+            recurrence = serialize_recurrence(recurrence)
+        
+        task = {
+            'id': row['id'],
+            'title': row['title'],
+        }
+        if 'notes' in row:
+            task['notes'] = row['notes']
+        task.update({
+            'notes_preview': row['notes_preview'],
+            'status': row['status'],
+            'priority': row['priority'],
+            'due_date': _format_datetime(row['due_date']),
+            'start_date': _format_datetime(row['start_date']),
+            'duration_minutes': row['duration_minutes'],
+            'recurrence': recurrence,
+            'is_recurring': row['recurrence'] is not None,
+            'next_occurrence': _format_datetime(row['next_occurrence']),
+            'list': row['list_id'],
+        })
+        # Like TaskSerializer, list_name is omitted for tasks without a list
+        if row['list_id'] is not None:
+            task['list_name'] = row['list__name']
+        task.update({
+            'tags': tags_by_task.get(row['id'], []),
+            'kanban_order': row['kanban_order'],
+            'completed_at': _format_datetime(row['completed_at']),
+            'parent': parent_ids.get(row['path'][:-TASK_STEPLEN]) if row['depth'] > 1 else None,
+            'children_count': row['numchild'],
+            'depth': row['depth'],
+            'created_at': _format_datetime(row['created_at']),
+            'updated_at': _format_datetime(row['updated_at']),
+        })
+        data.append(task)
+    
+    return data
+
+
+def flat_task_tree(queryset):
+    """
+    Render a task forest as a flat, path-ordered list of fast_task_list() nodes.
+    
+    Parents always precede their children and each node carries its
+    parent id and depth, so clients rebuild the nesting in one pass.
+    Replaces the per-node recursion of TaskTreeSerializer. Nodes carry
+    notes_preview but not the full notes, which the task detail returns.
+    
+    Returns:
+        {'nodes': [...]}
+    """
+    rows = list(task_list_values(queryset.order_by('path'), columns=TASK_TREE_COLUMNS))
+    parent_ids = {row['path']: row['id'] for row in rows}
+    return {'nodes': fast_task_list(rows, parent_ids=parent_ids)}
+
+
 class TaskTreeSerializer(TaskSerializer):
     """
     Serializer for Task with recursive children.
     Used for displaying full task hierarchies.
+    
+    Children are read from an in-memory tree map (context['_tree_map'])
+    instead of one get_children() query per node. Pass
+    build_tree_map(tasks) in the context to serialize a whole forest from
+    one query; otherwise each root loads its subtree with Task.get_tree().
     """
     
     children = serializers.SerializerMethodField()
@@ -117,9 +298,46 @@ class TaskTreeSerializer(TaskSerializer):
     class Meta(TaskSerializer.Meta):
         fields = TaskSerializer.Meta.fields + ['children']
     
+    @staticmethod
+    def build_tree_map(tasks):
+        """
+        Index already-loaded tasks by path and by parent path.
+        
+        Children keep the iteration order of tasks, so pass them in the
+        order siblings should be listed (Task.Meta.ordering).
+        """
+        nodes = {}
+        children = defaultdict(list)
+        for task in tasks:
+            nodes[task.path] = task
+            if task.depth > 1:
+                children[task.parent_path].append(task)
+        return {'nodes': nodes, 'children': children}
+    
+    def _tree_map(self, obj):
+        """Tree map covering obj, loading obj's subtree in one query if needed."""
+        tree_map = self.context.get('_tree_map')
+        if tree_map is None or obj.path not in tree_map['nodes']:
+            subtree = self.setup_eager_loading(Task.get_tree(obj)).order_by(
+                *Task._meta.ordering
+            )
+            tree_map = self.build_tree_map(subtree)
+            self.context['_tree_map'] = tree_map
+        return tree_map
+    
+    def get_parent(self, obj):
+        """Return parent task ID, resolved from the tree map when possible."""
+        if obj.depth == 1:
+            return None
+        tree_map = self.context.get('_tree_map')
+        parent = tree_map and tree_map['nodes'].get(obj.parent_path)
+        if parent is None:
+            return super().get_parent(obj)
+        return parent.id
+    
     def get_children(self, obj):
-        """Recursively serialize children."""
-        children = obj.get_children()
+        """Recursively serialize children from the tree map."""
+        children = self._tree_map(obj)['children'].get(obj.path, [])
         serializer = TaskTreeSerializer(children, many=True, context=self.context)
         return serializer.data
 
@@ -154,20 +372,51 @@ class HabitSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at', 'streak', 'completion_rate']
     
+    # Window of logs prefetched by setup_eager_loading (completion rate period)
+    RECENT_LOG_DAYS = 30
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Prefetch the last RECENT_LOG_DAYS of logs in one query and join
+        the nightly HabitStreak snapshot.
+        
+        streak, completion_rate and recent_logs are then computed from
+        habit.streak and habit._recent_logs instead of querying per habit.
+        """
+        since = timezone.now().date() - timedelta(days=cls.RECENT_LOG_DAYS)
+        return queryset.select_related('streak').prefetch_related(
+            Prefetch(
+                'logs',
+                queryset=HabitLog.objects.filter(date__gte=since).order_by('-date'),
+                to_attr='_recent_logs'
+            )
+        )
+    
     def get_streak(self, obj):
-        """Get current streak using service."""
+        """Get current streak using service (cached until the next log or day)."""
         from .services import HabitService
-        return HabitService.get_habit_streak(obj)
+        return HabitService.get_cached_habit_stat(
+            obj, 'streak',
+            lambda: HabitService.get_habit_streak(obj, logs=getattr(obj, '_recent_logs', None))
+        )
     
     def get_completion_rate(self, obj):
-        """Get 30-day completion rate."""
+        """Get 30-day completion rate (cached until the next log or day)."""
         from .services import HabitService
-        return round(HabitService.get_habit_completion_rate(obj, days=30), 1)
+        return HabitService.get_cached_habit_stat(
+            obj, f'completion_rate:{self.RECENT_LOG_DAYS}',
+            lambda: round(HabitService.get_habit_completion_rate(
+                obj, days=self.RECENT_LOG_DAYS, logs=getattr(obj, '_recent_logs', None)
+            ), 1)
+        )
     
     def get_recent_logs(self, obj):
         """Get last 7 days of logs."""
-        logs = obj.logs.all()[:7]
-        return HabitLogSerializer(logs, many=True).data
+        logs = getattr(obj, '_recent_logs', None)
+        if logs is None:
+            logs = obj.logs.all()
+        return HabitLogSerializer(logs[:7], many=True).data
 
 
 class SyncResponseSerializer(serializers.Serializer):
@@ -208,11 +457,12 @@ class TaskAttachmentSerializer(serializers.ModelSerializer):
         ]
     
     def get_file_url(self, obj):
-        """Return the full URL for the file."""
+        """Return the full URL for the file (cached, see cached_file_url)."""
+        url = obj.cached_file_url()
         request = self.context.get('request')
-        if obj.file and request:
-            return request.build_absolute_uri(obj.file.url)
-        return obj.file.url if obj.file else None
+        if url and request and url.startswith('/'):
+            return request.build_absolute_uri(url)
+        return url
     
     def validate_file(self, value):
         """Validate file size and extension."""
@@ -236,8 +486,8 @@ class TaskAttachmentSerializer(serializers.ModelSerializer):
         
         return value
     
-    def create(self, validated_data):
-        """Set file metadata on creation."""
+    def with_upload_metadata(self, validated_data):
+        """Add file metadata and uploaded_by to validated_data."""
         file = validated_data.get('file')
         if file:
             validated_data['file_name'] = file.name
@@ -249,5 +499,9 @@ class TaskAttachmentSerializer(serializers.ModelSerializer):
         if request and request.user.is_authenticated:
             validated_data['uploaded_by'] = request.user
         
-        return super().create(validated_data)
+        return validated_data
+    
+    def create(self, validated_data):
+        """Set file metadata on creation."""
+        return super().create(self.with_upload_metadata(validated_data))
 
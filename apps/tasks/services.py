@@ -13,11 +13,87 @@ Why a service layer?
 - Clearer separation of concerns
 """
 
+import hashlib
+import math
 from datetime import datetime, timedelta, date
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterable, Iterator
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import Q
-from .models import Task, Habit, HabitLog
+from django.db import connection, transaction
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Now
+from recurrence import serialize as serialize_recurrence
+from recurrence.base import DAILY, HOURLY, MINUTELY, WEEKLY
+from .models import (
+    OCCURRENCES_NOT_MATERIALIZED, Task, Habit, HabitLog, HabitStreak, RecurrenceOccurrence
+)
+
+# How far ahead recurring task occurrences are materialized
+OCCURRENCE_HORIZON = timedelta(days=180)
+
+# Above this, a task's occurrences are expanded on the fly instead of stored
+MAX_MATERIALIZED_OCCURRENCES = 1000
+
+# Fixed-length RRULE periods; a rule built only from these can have its
+# dtstart moved forward by whole periods without changing its occurrences
+FIXED_RRULE_PERIODS = {
+    WEEKLY: timedelta(weeks=1),
+    DAILY: timedelta(days=1),
+    HOURLY: timedelta(hours=1),
+    MINUTELY: timedelta(minutes=1),
+}
+
+# Task columns rendered into calendar instances
+CALENDAR_TASK_FIELDS = (
+    'id', 'title', 'notes', 'due_date', 'start_date',
+    'duration_minutes', 'priority', 'status', 'list_id',
+)
+
+# Columns a recurring task row needs on top of CALENDAR_TASK_FIELDS
+CALENDAR_RECURRING_FIELDS = (*CALENDAR_TASK_FIELDS, 'recurrence', 'occurrences_until')
+
+# Expanded occurrences are keyed on the rule itself, so entries never go
+# stale; the timeout only bounds how long unviewed windows are kept
+EXPANSION_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Gaps-and-islands over completed logs: consecutive dates share the same
+# date - row_number(), so each group is one run of completed days
+REFRESH_HABIT_STREAKS_SQL = """
+WITH runs AS (
+    SELECT habit_id, date,
+           date - (ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY date))::integer AS run_id
+    FROM habit_logs
+    WHERE completed AND date <= %(until)s
+),
+run_lengths AS (
+    SELECT habit_id, MAX(date) AS last_date, COUNT(*) AS length
+    FROM runs
+    GROUP BY habit_id, run_id
+)
+INSERT INTO habit_streaks (habit_id, current_streak, longest_streak, streak_until, updated_at)
+SELECT habits.id,
+       COALESCE(MAX(run_lengths.length) FILTER (WHERE run_lengths.last_date = %(until)s), 0),
+       COALESCE(MAX(run_lengths.length), 0),
+       %(until)s,
+       NOW()
+FROM habits
+LEFT JOIN run_lengths ON run_lengths.habit_id = habits.id
+WHERE habits.frequency = %(frequency)s
+GROUP BY habits.id
+ON CONFLICT (habit_id) DO UPDATE SET
+    current_streak = EXCLUDED.current_streak,
+    longest_streak = EXCLUDED.longest_streak,
+    streak_until = EXCLUDED.streak_until,
+    updated_at = EXCLUDED.updated_at
+"""
+
+# Days of habit logs fetched per streak query; longer streaks take
+# another window
+STREAK_WINDOW_DAYS = 365
+
+# Habit stats only change when a log is written (which bumps
+# habit.updated_at) or the day rolls over, both part of the cache key
+HABIT_STATS_TIMEOUT = 60 * 60 * 24
 
 
 class RecurrenceService:
@@ -46,17 +122,60 @@ class RecurrenceService:
         # django-recurrence provides .after() method to get next occurrence
         # after a given datetime
         try:
-            occurrences = task.recurrence.after(after, inc=False, dtstart=task.due_date or after)
+            dtstart = RecurrenceService._fast_forward_dtstart(
+                task.recurrence, task.due_date, after
+            ) or after
+            occurrences = task.compiled_rrule(dtstart).after(after, inc=False)
             return occurrences
         except (StopIteration, AttributeError):
             return None
     
+    @staticmethod
+    def _fast_forward_dtstart(recurrence, due_date: Optional[datetime], start_date: datetime) -> Optional[datetime]:
+        """
+        RRULE start to expand from, moved as close to start_date as is safe.
+        
+        dateutil iterates from dtstart, so a DAILY task due years ago pays
+        for every day since. When every rule has a fixed-length period
+        (FIXED_RRULE_PERIODS) and no COUNT or BYSETPOS, the occurrences
+        after a dtstart shifted by whole multiples of the common step
+        (period x INTERVAL, lcm across rules) are unchanged: weekday,
+        time of day and interval phase are all preserved. The result
+        stays strictly before start_date, so a synthesized dtstart is
+        never itself returned as an occurrence.
+        
+        Args:
+            recurrence: Task recurrence
+            due_date: Task due date (the RRULE start)
+            start_date: Start of the range being expanded
+            
+        Returns:
+            Shifted dtstart, or due_date when it cannot be moved
+        """
+        dtstart = due_date
+        rules = [*recurrence.rrules, *recurrence.exrules]
+        if dtstart is None or dtstart >= start_date or not rules:
+            return dtstart
+        
+        step_seconds = 1
+        for rule in rules:
+            period = FIXED_RRULE_PERIODS.get(rule.freq)
+            if period is None or rule.count or rule.bysetpos:
+                return dtstart
+            rule_seconds = int(period.total_seconds()) * (rule.interval or 1)
+            step_seconds = math.lcm(step_seconds, rule_seconds)
+        
+        step = timedelta(seconds=step_seconds)
+        # Largest whole number of steps that still lands before start_date
+        steps = (start_date - dtstart - timedelta(microseconds=1)) // step
+        return dtstart + steps * step
+    
     @staticmethod
     def expand_recurring_instances(
         task: Task,
         start_date: datetime,
         end_date: datetime
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[Dict[str, Any]]:
         """
         Expand a recurring task into virtual instances for a date range.
         These are NOT saved to database - they're generated on-the-fly for calendar views.
@@ -67,61 +186,217 @@ class RecurrenceService:
             end_date: End of date range
             
         Returns:
-            List of dicts representing virtual task instances
+            Iterator of dicts representing virtual task instances
         """
-        if not task.recurrence:
-            # Non-recurring task - return single instance if in range
-            if task.due_date and start_date <= task.due_date <= end_date:
-                return [RecurrenceService._task_to_dict(task, task.due_date)]
-            return []
+        row = {field: getattr(task, field) for field in CALENDAR_TASK_FIELDS}
+        row['recurrence'] = task.recurrence
+        return RecurrenceService._expand_rows([row], start_date, end_date)
+    
+    @staticmethod
+    def _expand_rows(
+        rows: Iterable[Dict[str, Any]],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        expand_recurring_instances() for .values(*CALENDAR_RECURRING_FIELDS) rows.
         
-        instances = []
+        Cached expansions are read with one get_many() and the misses are
+        written back with one set_many() once all rows are expanded, so a
+        calendar costs two cache round-trips rather than one per task.
+        """
+        pending = []
+        for row in rows:
+            recurrence, due_date = row['recurrence'], row['due_date']
+            if not recurrence:
+                # Non-recurring task - return single instance if in range
+                if due_date and start_date <= due_date <= end_date:
+                    yield RecurrenceService._task_to_dict(row, due_date)
+            # Out-of-window rules need neither dateutil nor a cache lookup
+            elif not RecurrenceService._cannot_occur_in(recurrence, due_date, start_date, end_date):
+                key = RecurrenceService._expansion_cache_key(
+                    row['id'], recurrence, due_date, start_date, end_date
+                )
+                pending.append((key, row))
+        if not pending:
+            return
+        
+        cached = cache.get_many([key for key, _ in pending])
+        misses = {}
+        for key, row in pending:
+            occurrences = cached.get(key)
+            if occurrences is None:
+                occurrences = misses[key] = RecurrenceService._expand_occurrences(
+                    row['recurrence'], row['due_date'], start_date, end_date
+                )
+            yield from RecurrenceService._row_instances(row, occurrences)
+        
+        if misses:
+            cache.set_many(misses, timeout=EXPANSION_CACHE_TIMEOUT)
+    
+    @staticmethod
+    def _expansion_cache_key(
+        task_id: int,
+        recurrence,
+        due_date: Optional[datetime],
+        start_date: datetime,
+        end_date: datetime
+    ) -> str:
+        """
+        Cache key for a task's occurrences in a window.
+        
+        Hashes the RRULE text and due date (the expansion inputs), so
+        editing the schedule reads a new key while edits to other fields
+        keep hitting the cache.
+        """
+        rule = serialize_recurrence(recurrence)
+        schedule = f"{rule}|{due_date.isoformat() if due_date else ''}"
+        rule_hash = hashlib.sha1(schedule.encode()).hexdigest()[:16]
+        return f"rrx:{task_id}:{rule_hash}:{start_date.isoformat()}:{end_date.isoformat()}"
+    
+    @staticmethod
+    def _cannot_occur_in(
+        recurrence,
+        due_date: Optional[datetime],
+        start_date: datetime,
+        end_date: datetime
+    ) -> bool:
+        """
+        Cheap check that the recurrence has no occurrences in the window.
         
+        True when the rules start after the window or all of them end
+        (UNTIL) before it. Explicit RDATEs can fall anywhere, so any
+        recurrence with RDATEs is always expanded, as is one whose start
+        (itself an occurrence) is inside the window.
+        """
+        if recurrence.rdates:
+            return False
+        if due_date and start_date <= due_date <= end_date:
+            return False
+        if not recurrence.rrules:
+            return True
+        if due_date and due_date > end_date:
+            return True
+        
+        untils = [rule.until for rule in recurrence.rrules]
+        if None in untils:
+            return False
+        last_until = max(
+            until.replace(tzinfo=start_date.tzinfo) if timezone.is_naive(until) else until
+            for until in untils
+        )
+        return last_until < start_date
+    
+    @staticmethod
+    def _expand_occurrences(
+        recurrence,
+        due_date: Optional[datetime],
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[datetime]:
+        """Run the RRULE expansion for a window (uncached)."""
         # Get all occurrences in the date range using django-recurrence
         # The between() method returns all occurrences between two dates
         try:
-            dtstart = task.due_date or start_date
-            occurrences = task.recurrence.between(
-                start_date,
-                end_date,
-                inc=True,
-                dtstart=dtstart
+            dtstart = RecurrenceService._fast_forward_dtstart(
+                recurrence, due_date, start_date
+            ) or start_date
+            return recurrence.to_dateutil_rruleset(dtstart=dtstart).between(
+                start_date, end_date, inc=True
             )
-            
-            for occurrence in occurrences:
-                instances.append(RecurrenceService._task_to_dict(task, occurrence))
-        
         except (StopIteration, AttributeError):
-            pass
+            return []
+    
+    @staticmethod
+    def materialize_occurrences(task: Task, horizon: Optional[timedelta] = None) -> int:
+        """
+        Store a recurring task's occurrences as RecurrenceOccurrence rows.
+        
+        Occurrences run from the task's due date (the RRULE start) to
+        now + horizon. Tasks without a due date, or whose window is empty
+        or would exceed MAX_MATERIALIZED_OCCURRENCES, are marked with
+        OCCURRENCES_NOT_MATERIALIZED and keep being expanded on the fly.
+        
+        Args:
+            task: Task to materialize (non-recurring tasks are cleared)
+            horizon: How far ahead to materialize (default: OCCURRENCE_HORIZON)
+            
+        Returns:
+            Number of occurrences stored
+        """
+        until = timezone.now() + (horizon or OCCURRENCE_HORIZON)
+        occurrences = []
+        if task.recurrence is not None and task.due_date:
+            try:
+                occurrences = task.compiled_rrule(task.due_date).between(
+                    task.due_date, until, inc=True
+                )
+            except (StopIteration, AttributeError):
+                occurrences = []
+        
+        materialized = bool(occurrences) and len(occurrences) <= MAX_MATERIALIZED_OCCURRENCES
+        if materialized:
+            occurrences_until = until
+        elif task.recurrence is not None:
+            occurrences_until = OCCURRENCES_NOT_MATERIALIZED
+        else:
+            occurrences_until = None
+        
+        with transaction.atomic():
+            RecurrenceOccurrence.objects.filter(task=task).delete()
+            if materialized:
+                RecurrenceOccurrence.objects.bulk_create(
+                    [RecurrenceOccurrence(task=task, occurs_at=occurs_at) for occurs_at in occurrences],
+                    ignore_conflicts=True
+                )
+            Task.objects.filter(pk=task.pk).update(occurrences_until=occurrences_until)
         
-        return instances
+        return len(occurrences) if materialized else 0
     
     @staticmethod
-    def _task_to_dict(task: Task, occurrence_date: datetime) -> Dict[str, Any]:
+    def _task_to_dict(row: Dict[str, Any], occurrence_date: datetime) -> Dict[str, Any]:
         """
-        Convert a task and occurrence date to a dictionary for API responses.
+        Convert a task row and occurrence date to a dictionary for API responses.
         
         Args:
-            task: Original task
+            row: Task values with at least CALENDAR_TASK_FIELDS
             occurrence_date: Specific occurrence date
             
         Returns:
             Dict with task data for this occurrence
         """
-        return {
-            'id': f"{task.id}_{occurrence_date.isoformat()}",  # Virtual ID
-            'original_id': task.id,
-            'title': task.title,
-            'notes': task.notes,
-            'due_date': occurrence_date.isoformat(),
-            'start_date': task.start_date.isoformat() if task.start_date else None,
-            'duration_minutes': task.duration_minutes,
-            'priority': task.priority,
-            'status': task.status,
-            'list_id': task.list_id,
+        return next(RecurrenceService._row_instances(row, [occurrence_date]))
+    
+    @staticmethod
+    def _row_instances(row: Dict[str, Any], occurrences: Iterable[datetime]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield an instance dict for each occurrence of a task row.
+        
+        The fields shared by every occurrence are rendered once into a
+        template; each instance is a copy with its id and due date set.
+        """
+        task_id = row['id']
+        template = {
+            'id': None,  # Virtual ID, set per occurrence
+            'original_id': task_id,
+            'title': row['title'],
+            'notes': row['notes'],
+            'due_date': None,
+            'start_date': row['start_date'].isoformat() if row['start_date'] else None,
+            'duration_minutes': row['duration_minutes'],
+            'priority': row['priority'],
+            'status': row['status'],
+            'list_id': row['list_id'],
             'is_recurring': True,
             'is_virtual': True,  # Flag to indicate this is a virtual instance
         }
+        
+        for occurrence in occurrences:
+            iso = occurrence.isoformat()
+            instance = template.copy()
+            instance['id'] = f"{task_id}_{iso}"
+            instance['due_date'] = iso
+            yield instance
     
     @staticmethod
     def complete_recurring_task(task: Task) -> Task:
@@ -138,29 +413,38 @@ class RecurrenceService:
             
         Returns:
             Updated task with next occurrence
-        """
-        if not task.recurrence:
-            # Non-recurring task - just mark complete
-            task.status = Task.STATUS_COMPLETED
-            task.save()
-            return task
-        
-        # Get next occurrence after current due date
-        next_due = RecurrenceService.get_next_occurrence(
-            task,
-            after=task.due_date or timezone.now()
-        )
         
-        if next_due:
-            # Update task to next occurrence
-            task.due_date = next_due
-            task.status = Task.STATUS_TODO
-            task.completed_at = None
-            task.save()
-        else:
-            # No more occurrences - mark as completed
-            task.status = Task.STATUS_COMPLETED
-            task.save()
+        The row is locked (SELECT ... FOR UPDATE) for the whole transition,
+        so concurrent completions run one after the other, each from the
+        committed state, and only the changed columns are written.
+        """
+        with transaction.atomic():
+            task = Task.objects.select_for_update().get(pk=task.pk)
+            
+            if not task.recurrence:
+                # Non-recurring task - just mark complete
+                task.status = Task.STATUS_COMPLETED
+                task.save(update_fields=['status', 'updated_at'])
+                return task
+            
+            # Next occurrence after current due date, precomputed by Task.save()
+            next_due = task.next_occurrence
+            if next_due is None:
+                next_due = RecurrenceService.get_next_occurrence(
+                    task,
+                    after=task.due_date or timezone.now()
+                )
+            
+            if next_due:
+                # Update task to next occurrence (completed_at is cleared by
+                # the tasks_set_completed_at trigger)
+                task.due_date = next_due
+                task.status = Task.STATUS_TODO
+                task.save(update_fields=['due_date', 'status', 'updated_at'])
+            else:
+                # No more occurrences - mark as completed
+                task.status = Task.STATUS_COMPLETED
+                task.save(update_fields=['status', 'updated_at'])
         
         return task
 
@@ -171,7 +455,7 @@ class TaskService:
     """
     
     @staticmethod
-    def reorder_tasks(task_orders: List[Dict[str, Any]]) -> None:
+    def reorder_tasks(task_orders: List[Dict[str, Any]], user) -> None:
         """
         Bulk update kanban_order for drag-and-drop reordering.
         
@@ -180,18 +464,33 @@ class TaskService:
         - Task B: order 2.0
         - Insert between: order 1.5
         
+        All orders are written by one UPDATE ... SET kanban_order = CASE id
+        ... END statement; if any task is missing or not owned by user,
+        nothing is changed.
+        
         Args:
             task_orders: List of {'id': task_id, 'order': new_order_float}
+            user: Owner of the tasks
+            
+        Raises:
+            Task.DoesNotExist: If a task does not exist or belongs to another user
         """
-        tasks_to_update = []
-        
-        for item in task_orders:
-            task = Task.objects.get(id=item['id'])
-            task.kanban_order = item['order']
-            tasks_to_update.append(task)
-        
-        # Bulk update for performance
-        Task.objects.bulk_update(tasks_to_update, ['kanban_order'])
+        # Later entries for the same task win, as with sequential updates
+        orders = {item['id']: item['order'] for item in task_orders}
+        if not orders:
+            return
+        
+        with transaction.atomic():
+            updated = Task.objects.filter(pk__in=orders, user=user).update(
+                kanban_order=Case(
+                    *[When(pk=task_id, then=Value(order)) for task_id, order in orders.items()],
+                    output_field=FloatField()
+                ),
+                # Queryset updates skip auto_now; delta sync reads updated_at
+                updated_at=Now()
+            )
+            if updated != len(orders):
+                raise Task.DoesNotExist("One or more tasks do not exist")
     
     @staticmethod
     def move_task_to_list(task: Task, new_list) -> Task:
@@ -215,41 +514,69 @@ class TaskService:
         start_date: datetime,
         end_date: datetime,
         include_recurring: bool = True
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[Dict[str, Any]]:
         """
         Get all tasks (including expanded recurring instances) for a date range.
         This is used by the calendar view.
         
+        Instances are generated lazily so callers can stream them instead
+        of holding the whole expansion in memory.
+        
         Args:
             user: User to get tasks for
             start_date: Start of range
             end_date: End of range
             include_recurring: Whether to expand recurring tasks
             
-        Returns:
-            List of task dicts (mix of real and virtual instances)
+        Yields:
+            Task dicts (mix of real and virtual instances)
         """
-        # Get all tasks with due dates in range (non-recurring OR recurring)
-        tasks = Task.objects.filter(
-            user=user,
-            due_date__isnull=False
-        ).select_related('list').prefetch_related('tags')
-        
-        all_instances = []
+        # Tasks that are not expanded only matter when due inside the
+        # window: filter them in SQL and render straight from .values() rows
+        tasks = Task.objects.filter(user=user, due_date__isnull=False)
+        not_recurring = Q(recurrence__isnull=True) | Q(recurrence='')
+        # Same predicate as the task_user_recurring_idx partial index
+        is_recurring = Q(recurrence__isnull=False) & ~Q(recurrence='')
+        single = tasks.filter(due_date__range=(start_date, end_date))
+        if include_recurring:
+            single = single.filter(not_recurring)
+        
+        for row in single.values(*CALENDAR_TASK_FIELDS).iterator():
+            yield RecurrenceService._task_to_dict(row, row['due_date'])
+        if not include_recurring:
+            return
+        
+        # Recurring tasks that start after the window have no occurrences
+        # in it; rows are plain dicts, no Task instances are built
+        recurring = list(
+            tasks.filter(is_recurring, due_date__lte=end_date).values(
+                *CALENDAR_RECURRING_FIELDS
+            )
+        )
         
-        for task in tasks:
-            if task.is_recurring and include_recurring:
-                # Expand recurring task into virtual instances
-                instances = RecurrenceService.expand_recurring_instances(
-                    task, start_date, end_date
-                )
-                all_instances.extend(instances)
+        # Recurring tasks materialized past end_date are read from
+        # RecurrenceOccurrence in one range query instead of RRULE expansion
+        materialized = {
+            row['id']: [] for row in recurring
+            if row['occurrences_until'] and end_date <= row['occurrences_until']
+        }
+        if materialized:
+            occurrences = RecurrenceOccurrence.objects.filter(
+                task_id__in=materialized,
+                occurs_at__range=(start_date, end_date)
+            ).values_list('task_id', 'occurs_at')
+            for task_id, occurs_at in occurrences:
+                materialized[task_id].append(occurs_at)
+        
+        expanded = []
+        for row in recurring:
+            if row['id'] in materialized:
+                yield from RecurrenceService._row_instances(row, materialized[row['id']])
             else:
-                # Regular task - include if in range
-                if start_date <= task.due_date <= end_date:
-                    all_instances.append(RecurrenceService._task_to_dict(task, task.due_date))
+                expanded.append(row)
         
-        return all_instances
+        # Expand the rest into virtual instances, batching the cache lookups
+        yield from RecurrenceService._expand_rows(expanded, start_date, end_date)
 
 
 class HabitService:
@@ -267,6 +594,10 @@ class HabitService:
         """
         Create or update a habit log entry.
         
+        Written with a single INSERT ... ON CONFLICT (habit, date) DO
+        UPDATE instead of update_or_create()'s SELECT then INSERT/UPDATE.
+        The upsert skips HabitLog.save(), so the habit is touched here.
+        
         Args:
             habit: Habit to log
             log_date: Date of the log
@@ -274,63 +605,200 @@ class HabitService:
             notes: Optional notes
             
         Returns:
-            HabitLog instance
-        """
-        log, created = HabitLog.objects.update_or_create(
-            habit=habit,
-            date=log_date,
-            defaults={
-                'completed': completed,
-                'notes': notes
-            }
+            HabitLog instance with the written values (Django does not
+            return ids from conflict upserts, so its pk is not set)
+        """
+        log = HabitLog(habit=habit, date=log_date, completed=completed, notes=notes)
+        HabitLog.objects.bulk_create(
+            [log],
+            update_conflicts=True,
+            unique_fields=['habit', 'date'],
+            update_fields=['completed', 'notes', 'updated_at'],
         )
+        log.touch_habit()
         return log
     
     @staticmethod
-    def get_habit_streak(habit: Habit) -> int:
+    def habit_stat_cache_key(habit: Habit, name: str) -> str:
+        """
+        Cache key for a computed habit stat.
+        
+        Keyed on habit.updated_at and today's date, so a new log or a
+        new day reads a fresh key and old entries simply expire.
+        """
+        today = timezone.now().date()
+        return f"habit:{habit.pk}:{habit.updated_at.timestamp()}:{today}:{name}"
+    
+    @staticmethod
+    def get_cached_habit_stat(habit: Habit, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return a habit stat from the cache, computing and storing it on a miss.
+        
+        Args:
+            habit: Habit the stat belongs to
+            name: Stat name, e.g. 'streak' or 'completion_rate:30'
+            compute: Zero-argument callable producing the value
+        """
+        return cache.get_or_set(
+            HabitService.habit_stat_cache_key(habit, name),
+            compute,
+            timeout=HABIT_STATS_TIMEOUT,
+        )
+    
+    @staticmethod
+    def _walk_streak(logs, current_date: date):
+        """
+        Count consecutive completed days backwards from current_date.
+        
+        Returns:
+            (streak, next date to check, True if logs ran out unbroken)
+        """
+        streak = 0
+        for log in logs:
+            if log.date > current_date:
+                continue
+            if log.date != current_date or not log.completed:
+                # Gap or missed day - streak broken
+                return streak, current_date, False
+            streak += 1
+            current_date -= timedelta(days=1)
+        return streak, current_date, True
+    
+    @staticmethod
+    def get_habit_streak(habit: Habit, logs: Optional[List[HabitLog]] = None) -> int:
         """
         Calculate current streak for a habit.
         Streak = consecutive days the habit was completed.
         
         Args:
             habit: Habit to calculate streak for
+            logs: Already-loaded recent logs, newest first (e.g. a
+                prefetched window). Older logs are only queried if the
+                streak runs past the oldest one.
             
         Returns:
             Current streak count
         """
-        today = timezone.now().date()
-        streak = 0
-        
         # Only count daily habits for now (weekly habits need different logic)
         if habit.frequency != Habit.FREQUENCY_DAILY:
             return 0
         
-        # Check backwards from today
-        current_date = today
+        today = timezone.now().date()
+        
+        stored = HabitService._stored_streak(habit, today, logs)
+        if stored is not None:
+            return stored
         
+        if logs is None:
+            streak, current_date = 0, today
+        else:
+            streak, current_date, exhausted = HabitService._walk_streak(logs, today)
+            if not (exhausted and streak):
+                return streak
+        
+        # Continue in the DB one STREAK_WINDOW_DAYS range scan at a time,
+        # reading only dates. Completed logs only: a missed day shows up
+        # as a date gap, and the scan is served by the partial
+        # habit_log_completed_partial index
         while True:
-            try:
-                log = HabitLog.objects.get(habit=habit, date=current_date)
-                if log.completed:
-                    streak += 1
-                    current_date -= timedelta(days=1)
-                else:
-                    # Streak broken
+            window_start = current_date - timedelta(days=STREAK_WINDOW_DAYS - 1)
+            dates = HabitLog.objects.filter(
+                habit=habit,
+                completed=True,
+                date__range=(window_start, current_date)
+            ).order_by('-date').values_list('date', flat=True)
+            
+            walked = 0
+            for log_date in dates:
+                if log_date != current_date:
                     break
-            except HabitLog.DoesNotExist:
-                # No log for this date - streak broken
-                break
+                walked += 1
+                current_date -= timedelta(days=1)
+            
+            streak += walked
+            if walked < STREAK_WINDOW_DAYS:
+                return streak
+    
+    @staticmethod
+    def _stored_streak(habit: Habit, today: date, logs: Optional[List[HabitLog]] = None) -> Optional[int]:
+        """
+        Current streak from the nightly HabitStreak row plus today's check-in.
+        
+        Checking in today does not affect the snapshot. Logs written for
+        earlier days delete it (HabitLog.touch_habit); a snapshot that
+        still disagrees with the latest completed date at or before
+        streak_until (a bulk write that skipped touch_habit) is ignored.
+        
+        Args:
+            habit: Daily habit
+            today: Current date
+            logs: Optional recent logs, newest first (see get_habit_streak)
+        
+        Returns:
+            The streak, or None if there is no row, it is from an earlier
+            day, or it disagrees with the logs
+        """
+        try:
+            snapshot = habit.streak
+        except HabitStreak.DoesNotExist:
+            return None
+        yesterday = today - timedelta(days=1)
+        if snapshot.streak_until != yesterday:
+            return None
+        
+        # The two newest completed dates cover today's check-in and the
+        # last completion the snapshot must agree with
+        if logs is None:
+            recent_dates = list(
+                HabitLog.objects.filter(habit=habit, completed=True, date__lte=today)
+                .order_by('-date').values_list('date', flat=True)[:2]
+            )
+        else:
+            recent_dates = [log.date for log in logs if log.completed and log.date <= today][:2]
         
-        return streak
+        last_completed = next((day for day in recent_dates if day <= yesterday), None)
+        if (last_completed == yesterday) != (snapshot.current_streak > 0):
+            return None
+        
+        # Like the log walk, a streak only counts while today is done
+        completed_today = bool(recent_dates) and recent_dates[0] == today
+        return snapshot.current_streak + 1 if completed_today else 0
     
     @staticmethod
-    def get_habit_completion_rate(habit: Habit, days: int = 30) -> float:
+    def refresh_habit_streaks(until: Optional[date] = None) -> int:
+        """
+        Recompute the HabitStreak row of every daily habit in one query.
+        
+        Args:
+            until: Last day to include (default: yesterday)
+            
+        Returns:
+            Number of habits refreshed
+        """
+        if until is None:
+            until = timezone.now().date() - timedelta(days=1)
+        
+        with connection.cursor() as cursor:
+            cursor.execute(REFRESH_HABIT_STREAKS_SQL, {
+                'until': until,
+                'frequency': Habit.FREQUENCY_DAILY,
+            })
+            return cursor.rowcount
+    
+    @staticmethod
+    def get_habit_completion_rate(
+        habit: Habit,
+        days: int = 30,
+        logs: Optional[List[HabitLog]] = None
+    ) -> float:
         """
         Calculate completion rate for a habit over the last N days.
         
         Args:
             habit: Habit to calculate for
             days: Number of days to look back
+            logs: Already-loaded logs covering at least the last N days;
+                counted in Python instead of querying
             
         Returns:
             Completion rate as percentage (0.0 to 100.0)
@@ -338,14 +806,20 @@ class HabitService:
         end_date = timezone.now().date()
         start_date = end_date - timedelta(days=days)
         
-        logs = HabitLog.objects.filter(
-            habit=habit,
-            date__gte=start_date,
-            date__lte=end_date
-        )
+        if logs is None:
+            completed_days = HabitLog.objects.filter(
+                habit=habit,
+                date__gte=start_date,
+                date__lte=end_date,
+                completed=True
+            ).count()
+        else:
+            completed_days = sum(
+                1 for log in logs
+                if log.completed and start_date <= log.date <= end_date
+            )
         
         total_days = (end_date - start_date).days + 1
-        completed_days = logs.filter(completed=True).count()
         
         if total_days == 0:
             return 0.0
@@ -0,0 +1,38 @@
+"""
+Signal handlers for Tasks App.
+
+Tag links are stored in the Task.tags through table, so changing them
+does not go through Task.save(). These handlers bump Task.updated_at so
+delta sync (?since=) picks up retagged tasks.
+"""
+
+from django.db.models.functions import Now
+from django.db.models.signals import m2m_changed, pre_delete
+from django.dispatch import receiver
+
+from .models import Tag, Task
+
+
+def _touch_tasks(queryset):
+    queryset.update(updated_at=Now())
+
+
+@receiver(m2m_changed, sender=Task.tags.through)
+def touch_retagged_tasks(sender, instance, action, reverse, pk_set, **kwargs):
+    """Bump updated_at of tasks whose tags were added, removed or cleared."""
+    if not reverse:
+        # task.tags.add()/remove()/set()/clear()
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            _touch_tasks(Task.objects.filter(pk=instance.pk))
+    elif action in ('post_add', 'post_remove'):
+        # tag.tasks.add()/remove()
+        _touch_tasks(Task.objects.filter(pk__in=pk_set))
+    elif action == 'pre_clear':
+        # tag.tasks.clear(); the links are gone by post_clear
+        _touch_tasks(Task.objects.filter(tags=instance))
+
+
+@receiver(pre_delete, sender=Tag)
+def touch_tasks_of_deleted_tag(sender, instance, **kwargs):
+    """Deleting a tag drops its links without m2m_changed."""
+    _touch_tasks(Task.objects.filter(tags=instance))
@@ -0,0 +1,84 @@
+"""
+Celery Tasks for Tasks App.
+
+This module contains async and scheduled tasks for:
+- Materializing recurring task occurrences for the calendar
+- Refreshing the nightly habit streak snapshots
+
+Usage:
+    from apps.tasks.tasks import materialize_task_occurrences
+    materialize_task_occurrences.delay(task_id=1)
+"""
+
+import logging
+from datetime import timedelta
+from celery import shared_task
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Re-materialize once less than this much of the horizon is left
+OCCURRENCE_REFRESH_MARGIN = timedelta(days=30)
+
+
+@shared_task(bind=True, max_retries=3)
+def materialize_task_occurrences(self, task_id: int):
+    """
+    Rebuild the stored occurrences of one task.
+    Queued by Task.save() when its RRULE or due date changes.
+    """
+    from .models import Task
+    from .services import RecurrenceService
+    
+    try:
+        task = Task.objects.defer('search_vector').get(id=task_id)
+    except Task.DoesNotExist:
+        return
+    
+    count = RecurrenceService.materialize_occurrences(task)
+    return f"Materialized {count} occurrences for task {task_id}"
+
+
+@shared_task
+def refresh_recurrence_occurrences():
+    """
+    Extend materialized occurrences that are close to their horizon.
+    Runs daily via Celery Beat.
+    """
+    from .models import OCCURRENCES_NOT_MATERIALIZED, Task
+    from .services import RecurrenceService, OCCURRENCE_HORIZON
+    
+    threshold = timezone.now() + OCCURRENCE_HORIZON - OCCURRENCE_REFRESH_MARGIN
+    stale = Task.objects.filter(
+        recurrence__isnull=False,
+        due_date__isnull=False
+    ).exclude(
+        recurrence=''
+    ).filter(
+        Q(occurrences_until__isnull=True) | Q(occurrences_until__lt=threshold)
+    ).exclude(
+        # Already found unmaterializable; save() resets it on schedule changes
+        occurrences_until=OCCURRENCES_NOT_MATERIALIZED
+    ).defer('search_vector')
+    
+    refreshed = 0
+    for task in stale.iterator(chunk_size=200):
+        RecurrenceService.materialize_occurrences(task)
+        refreshed += 1
+    
+    logger.info(f"Refreshed occurrences for {refreshed} recurring tasks")
+    return f"Refreshed {refreshed} recurring tasks"
+
+
+@shared_task
+def refresh_habit_streaks():
+    """
+    Recompute every daily habit's streak snapshot in one query.
+    Runs nightly via Celery Beat, after the day has closed.
+    """
+    from .services import HabitService
+    
+    refreshed = HabitService.refresh_habit_streaks()
+    logger.info(f"Refreshed streaks for {refreshed} habits")
+    return f"Refreshed {refreshed} habit streaks"
@@ -0,0 +1,249 @@
+"""
+Tests for Tasks app.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from recurrence import deserialize as deserialize_recurrence
+from rest_framework.renderers import JSONRenderer
+
+from .models import Habit, HabitLog, HabitStreak, List, Tag, Task
+from .serializers import TaskSerializer, fast_task_list, flat_task_tree, task_list_values
+from .services import HabitService, RecurrenceService
+
+User = get_user_model()
+
+
+class HabitStreakSnapshotTest(TestCase):
+    """Test the nightly HabitStreak snapshot (REFRESH_HABIT_STREAKS_SQL)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser')
+        self.habit = Habit.objects.create(user=self.user, name='Read')
+        self.today = timezone.now().date()
+        self.yesterday = self.today - timedelta(days=1)
+
+    def log_days(self, *days_ago, completed=True):
+        """Log the habit on each of the given days before today."""
+        for days in days_ago:
+            HabitLog.objects.create(
+                habit=self.habit,
+                date=self.today - timedelta(days=days),
+                completed=completed
+            )
+
+    def test_current_and_longest_streak(self):
+        """Test runs of completed days are found and measured."""
+        self.log_days(1, 2, 3, 6, 7, 8, 9, 10)
+        self.log_days(4, completed=False)
+
+        refreshed = HabitService.refresh_habit_streaks(until=self.yesterday)
+
+        self.assertEqual(refreshed, 1)
+        snapshot = HabitStreak.objects.get(habit=self.habit)
+        self.assertEqual(snapshot.current_streak, 3)
+        self.assertEqual(snapshot.longest_streak, 5)
+        self.assertEqual(snapshot.streak_until, self.yesterday)
+
+    def test_streak_broken_before_until(self):
+        """Test a run that ends before until is not the current streak."""
+        self.log_days(2, 3)
+
+        HabitService.refresh_habit_streaks(until=self.yesterday)
+
+        snapshot = HabitStreak.objects.get(habit=self.habit)
+        self.assertEqual(snapshot.current_streak, 0)
+        self.assertEqual(snapshot.longest_streak, 2)
+
+    def test_logs_after_until_ignored(self):
+        """Test today's log is left for the read path."""
+        self.log_days(0, 1)
+
+        HabitService.refresh_habit_streaks(until=self.yesterday)
+
+        snapshot = HabitStreak.objects.get(habit=self.habit)
+        self.assertEqual(snapshot.current_streak, 1)
+        self.assertEqual(snapshot.longest_streak, 1)
+
+    def test_habit_without_logs(self):
+        """Test habits with no completed logs get an empty snapshot."""
+        HabitService.refresh_habit_streaks(until=self.yesterday)
+
+        snapshot = HabitStreak.objects.get(habit=self.habit)
+        self.assertEqual(snapshot.current_streak, 0)
+        self.assertEqual(snapshot.longest_streak, 0)
+
+    def test_non_daily_habits_skipped(self):
+        """Test only daily habits are snapshotted."""
+        weekly = Habit.objects.create(
+            user=self.user, name='Review', frequency=Habit.FREQUENCY_WEEKLY
+        )
+
+        HabitService.refresh_habit_streaks(until=self.yesterday)
+
+        self.assertFalse(HabitStreak.objects.filter(habit=weekly).exists())
+
+    def test_refresh_updates_existing_row(self):
+        """Test a second refresh overwrites the snapshot."""
+        self.log_days(1)
+        HabitService.refresh_habit_streaks(until=self.yesterday)
+        self.log_days(0)
+
+        HabitService.refresh_habit_streaks(until=self.today)
+
+        snapshot = HabitStreak.objects.get(habit=self.habit)
+        self.assertEqual(snapshot.current_streak, 2)
+        self.assertEqual(snapshot.streak_until, self.today)
+
+    def test_snapshot_used_after_checking_in_today(self):
+        """Test today's log (which bumps habit.updated_at) keeps the snapshot."""
+        self.log_days(1, 2, 3)
+        HabitService.refresh_habit_streaks(until=self.yesterday)
+        # Only reachable through the snapshot, not by walking the logs
+        HabitStreak.objects.filter(habit=self.habit).update(current_streak=10)
+        self.log_days(0)
+
+        habit = Habit.objects.select_related('streak').get(pk=self.habit.pk)
+
+        self.assertEqual(HabitService.get_habit_streak(habit), 11)
+
+    def test_snapshot_ignored_when_yesterday_changed(self):
+        """Test a snapshot contradicted by the logs falls back to the walk."""
+        self.log_days(0, 1, 2)
+        HabitService.refresh_habit_streaks(until=self.yesterday)
+        HabitStreak.objects.filter(habit=self.habit).update(current_streak=10)
+        HabitLog.objects.filter(habit=self.habit, date=self.yesterday).update(completed=False)
+
+        habit = Habit.objects.select_related('streak').get(pk=self.habit.pk)
+
+        self.assertEqual(HabitService.get_habit_streak(habit), 1)
+
+    def test_backfilled_gap_drops_snapshot(self):
+        """Test logging an earlier day drops the snapshot until the next refresh."""
+        self.log_days(0, 1, 2, 4)
+        HabitService.refresh_habit_streaks(until=self.yesterday)
+
+        self.log_days(3)
+
+        self.assertFalse(HabitStreak.objects.filter(habit=self.habit).exists())
+        habit = Habit.objects.select_related('streak').get(pk=self.habit.pk)
+        self.assertEqual(HabitService.get_habit_streak(habit), 5)
+
+
+class FastForwardDtstartTest(SimpleTestCase):
+    """Test RecurrenceService._fast_forward_dtstart keeps occurrences unchanged."""
+
+    # A Monday, years before the windows below
+    due_date = datetime(2020, 1, 6, 9, 30, tzinfo=dt_timezone.utc)
+    start = datetime(2026, 3, 10, 12, 0, tzinfo=dt_timezone.utc)
+
+    def assertSameOccurrences(self, rule, start=None):
+        """Expand rule from due_date and from the shifted dtstart and compare."""
+        start = start or self.start
+        end = start + timedelta(days=60)
+        recurrence = deserialize_recurrence(rule)
+
+        dtstart = RecurrenceService._fast_forward_dtstart(recurrence, self.due_date, start)
+        original = recurrence.to_dateutil_rruleset(dtstart=self.due_date)
+        shifted = recurrence.to_dateutil_rruleset(dtstart=dtstart)
+
+        self.assertLess(dtstart, start)
+        self.assertEqual(
+            shifted.between(start, end, inc=True),
+            original.between(start, end, inc=True)
+        )
+        self.assertEqual(shifted.after(start, inc=False), original.after(start, inc=False))
+        return dtstart
+
+    def test_daily(self):
+        """Test a daily rule is moved to just before the window."""
+        dtstart = self.assertSameOccurrences('RRULE:FREQ=DAILY')
+        self.assertGreater(dtstart, self.start - timedelta(days=2))
+
+    def test_weekly_byday(self):
+        """Test weekday selection survives whole-week shifts."""
+        dtstart = self.assertSameOccurrences('RRULE:FREQ=WEEKLY;BYDAY=MO,WE,FR')
+        self.assertGreater(dtstart, self.due_date)
+
+    def test_interval(self):
+        """Test the INTERVAL phase is kept."""
+        self.assertSameOccurrences('RRULE:FREQ=DAILY;INTERVAL=3')
+        self.assertSameOccurrences('RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=TU')
+
+    def test_exrule(self):
+        """Test exclusion rules share the common step."""
+        self.assertSameOccurrences(
+            'RRULE:FREQ=DAILY;INTERVAL=2\nEXRULE:FREQ=WEEKLY;BYDAY=SA,SU'
+        )
+
+    def test_until(self):
+        """Test UNTIL inside and before the window."""
+        self.assertSameOccurrences('RRULE:FREQ=DAILY;UNTIL=20260325T000000Z')
+        self.assertSameOccurrences('RRULE:FREQ=DAILY;UNTIL=20260101T000000Z')
+
+    def test_window_starting_on_an_occurrence(self):
+        """Test the strict-before bound when start_date is an occurrence."""
+        start = self.due_date + timedelta(days=3 * 700)
+        dtstart = self.assertSameOccurrences('RRULE:FREQ=DAILY;INTERVAL=3', start=start)
+        self.assertEqual(dtstart, start - timedelta(days=3))
+
+    def test_count_not_shifted(self):
+        """Test COUNT rules keep their original start."""
+        recurrence = deserialize_recurrence('RRULE:FREQ=DAILY;COUNT=5000')
+
+        dtstart = RecurrenceService._fast_forward_dtstart(recurrence, self.due_date, self.start)
+
+        self.assertEqual(dtstart, self.due_date)
+
+
+class FastTaskListTest(TestCase):
+    """Test fast_task_list renders the same JSON as TaskSerializer(many=True)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser')
+        work = List.objects.create(user=self.user, name='Work')
+        urgent = Tag.objects.create(user=self.user, name='urgent', color='#ff0000')
+        home = Tag.objects.create(user=self.user, name='home')
+
+        Task.add_root(user=self.user, title='Plain task')
+        listed = Task.add_root(
+            user=self.user, title='Listed', notes='Some notes',
+            list=work, due_date=timezone.now(), priority=Task.PRIORITY_MEDIUM
+        )
+        listed.tags.add(urgent, home)
+        parent = Task.add_root(user=self.user, title='Parent', list=work)
+        child = parent.add_child(user=self.user, title='Child')
+        child.tags.add(home)
+        Task.add_root(
+            user=self.user, title='Daily', due_date=timezone.now(),
+            recurrence=deserialize_recurrence('RRULE:FREQ=DAILY;INTERVAL=2')
+        )
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_matches_task_serializer(self):
+        """Test lists, tags, parents and recurrence render identically."""
+        queryset = Task.objects.filter(user=self.user).order_by('path')
+        expected = TaskSerializer(
+            TaskSerializer.setup_eager_loading(queryset), many=True
+        ).data
+
+        actual = fast_task_list(task_list_values(queryset))
+
+        self.assertEqual(len(actual), 5)
+        self.assertEqual(self.render(actual), self.render(expected))
+
+    def test_flat_tree_reads_notes_preview_only(self):
+        """Test flat tree nodes carry notes_preview without the full notes."""
+        Task.objects.filter(title='Listed').update(notes='x' * 500)
+
+        nodes = flat_task_tree(Task.objects.filter(user=self.user))['nodes']
+
+        listed = next(node for node in nodes if node['title'] == 'Listed')
+        self.assertNotIn('notes', listed)
+        self.assertEqual(listed['notes_preview'], 'x' * 200)
+
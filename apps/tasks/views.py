@@ -3,7 +3,7 @@ API Views for Task Management.
 
 This module provides DRF ViewSets and custom endpoints:
 - ModelViewSets for CRUD operations
-- SyncAPIView for batch data loading
+- SyncAPIView for batch data loading (streamed, optional delta sync)
 - CalendarAPIView for date range queries with recurring task expansion
 - TaskReorderAPIView for drag-and-drop
 - CompleteRecurringTaskAPIView for special recurring task completion
@@ -13,17 +13,25 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.utils.encoders import JSONEncoder
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.conf import settings
 from django.utils.dateparse import parse_datetime
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.db.models import Count
 from datetime import datetime
+from itertools import islice
 
+from .cache import CALENDAR_CACHE_MAX_BYTES, CALENDAR_CACHE_TIMEOUT, calendar_cache_key
+from .filters import TaskSearchFilter
 from .models import List, Tag, Task, Habit, HabitLog, TaskAttachment
 from .serializers import (
     ListSerializer, TagSerializer, TaskSerializer, TaskTreeSerializer,
     HabitSerializer, HabitLogSerializer, SyncResponseSerializer,
-    TaskAttachmentSerializer
+    TaskAttachmentSerializer, fast_task_list, flat_task_tree, task_list_values
 )
 from .services import RecurrenceService, TaskService, HabitService
 
@@ -41,8 +49,8 @@ class ListViewSet(viewsets.ModelViewSet):
     ordering = ['sort_order', 'created_at']
     
     def get_queryset(self):
-        """Filter to current user's lists."""
-        return List.objects.filter(user=self.request.user)
+        """Filter to current user's lists, with task counts annotated."""
+        return List.objects.filter(user=self.request.user).annotate(task_count=Count('tasks'))
     
     def perform_create(self, serializer):
         """Automatically set user on creation."""
@@ -76,27 +84,50 @@ class TaskViewSet(viewsets.ModelViewSet):
     
     Supports:
     - Filtering by status, priority, list, tags
-    - Full-text search on title and notes
+    - Full-text search on title and notes (tsvector)
     - Ordering by various fields
     - Tree structure queries
     """
     
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TaskSearchFilter, OrderingFilter]
     filterset_fields = ['status', 'priority', 'list', 'tags']
-    search_fields = ['title', 'notes']
+    search_fields = ['title', 'notes']  # via Task.search_vector
     ordering_fields = ['due_date', 'priority', 'kanban_order', 'created_at']
     ordering = ['kanban_order', 'created_at']
     
+    # Actions that render tasks straight from the queryset; writes drop
+    # prefetched tags after saving, and list() reads .values() rows
+    EAGER_LOADING_ACTIONS = ('retrieve', 'tree')
+    
     def get_queryset(self):
         """
         Filter to current user's tasks with optimized queries.
+        
+        The list join and tags prefetch are only added for actions that
+        render them from the fetched rows.
         """
         queryset = Task.objects.filter(user=self.request.user)
-        queryset = queryset.select_related('list', 'user')
-        queryset = queryset.prefetch_related('tags')
-        return queryset
+        if self.action in self.EAGER_LOADING_ACTIONS:
+            return TaskSerializer.setup_eager_loading(queryset)
+        return queryset.defer('search_vector')
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List tasks through the read-only fast path.
+        
+        Rows are fetched with .values() and rendered by fast_task_list(),
+        which produces the TaskSerializer payload without building model
+        instances or walking serializer fields. Writes still go through
+        TaskSerializer.
+        """
+        queryset = task_list_values(self.filter_queryset(self.get_queryset()))
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast_task_list(page))
+        return Response(fast_task_list(queryset))
     
     def get_serializer_class(self):
         """Use TreeSerializer for tree action."""
@@ -111,12 +142,29 @@ class TaskViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def tree(self, request):
         """
-        Get tasks in tree structure (roots with nested children).
-        Only returns root tasks with all descendants nested.
+        Get tasks in tree structure.
+        
+        ?layout=flat returns {'nodes': [...]} ordered by path with parent
+        ids for the client to nest. ?layout=nested (legacy) returns root
+        tasks with all descendants nested. Defaults to TASK_TREE_LAYOUT.
         """
-        # Get root tasks (depth=1) for current user
-        root_tasks = self.get_queryset().filter(depth=1)
-        serializer = self.get_serializer(root_tasks, many=True)
+        layout = request.query_params.get('layout', settings.TASK_TREE_LAYOUT)
+        if layout not in ('flat', 'nested'):
+            return Response(
+                {'error': "layout must be 'flat' or 'nested'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if layout == 'flat':
+            return Response(flat_task_tree(self.get_queryset()))
+        
+        # Load the user's whole forest once; children are assembled in
+        # memory instead of one get_children() query per node
+        tasks = list(self.get_queryset())
+        root_tasks = [task for task in tasks if task.depth == 1]
+        
+        context = self.get_serializer_context()
+        context['_tree_map'] = TaskTreeSerializer.build_tree_map(tasks)
+        serializer = TaskTreeSerializer(root_tasks, many=True, context=context)
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
@@ -145,8 +193,8 @@ class HabitViewSet(viewsets.ModelViewSet):
     ordering = ['sort_order', 'created_at']
     
     def get_queryset(self):
-        """Filter to current user's habits."""
-        return Habit.objects.filter(user=self.request.user)
+        """Filter to current user's habits, with recent logs prefetched."""
+        return HabitSerializer.setup_eager_loading(Habit.objects.filter(user=self.request.user))
     
     def perform_create(self, serializer):
         """Automatically set user on creation."""
@@ -180,30 +228,94 @@ class SyncAPIView(APIView):
     - All tags
     - All habits
     
+    The payload is streamed section by section in chunks of
+    SYNC_CHUNK_SIZE rows, so memory stays flat however much data the
+    user has. Tasks, the largest section, are read as .values() rows
+    and rendered by fast_task_list() rather than as model instances. Pass ?since=<synced_at of the previous response> to only
+    receive tasks and tags updated after it (deletions are not reported);
+    lists and habits are always returned in full.
+    
     GET /api/sync/
+    GET /api/sync/?since=2025-11-01T00:00:00Z
     """
     
     permission_classes = [permissions.IsAuthenticated]
     
+    SYNC_CHUNK_SIZE = 500
+    
     def get(self, request):
-        """Return all user data."""
+        """Stream all (or recently updated) user data."""
         user = request.user
+        synced_at = timezone.now()
+        
+        since = None
+        since_str = request.query_params.get('since')
+        if since_str:
+            since = parse_datetime(since_str)
+            if since is None:
+                return Response(
+                    {'error': 'Invalid since. Use ISO format'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         
         # Fetch all data for user
-        tasks = Task.objects.filter(user=user).select_related('list').prefetch_related('tags')
-        lists = List.objects.filter(user=user)
+        tasks = Task.objects.filter(user=user)
+        lists = List.objects.filter(user=user).annotate(task_count=Count('tasks'))
         tags = Tag.objects.filter(user=user)
-        habits = Habit.objects.filter(user=user)
+        habits = HabitSerializer.setup_eager_loading(Habit.objects.filter(user=user))
         
-        # Serialize
-        data = {
-            'tasks': TaskSerializer(tasks, many=True).data,
-            'lists': ListSerializer(lists, many=True).data,
-            'tags': TagSerializer(tags, many=True).data,
-            'habits': HabitSerializer(habits, many=True).data,
-        }
+        if since is not None:
+            # Lists (task_count) and habits (streak, completion_rate) carry
+            # aggregates that change without touching their own row, so
+            # those small sections are always sent in full
+            tasks, tags = (
+                queryset.filter(updated_at__gt=since)
+                for queryset in (tasks, tags)
+            )
         
-        return Response(data)
+        # (name, queryset, render) where render turns a chunk into JSON data
+        sections = [
+            ('tasks', task_list_values(tasks), fast_task_list),
+            ('lists', lists, self._serialize_with(ListSerializer)),
+            ('tags', tags, self._serialize_with(TagSerializer)),
+            ('habits', habits, self._serialize_with(HabitSerializer)),
+        ]
+        
+        return StreamingHttpResponse(
+            self._stream(sections, synced_at),
+            content_type='application/json'
+        )
+    
+    @staticmethod
+    def _serialize_with(serializer_class):
+        """Render function serializing a chunk of instances with serializer_class."""
+        return lambda chunk: serializer_class(chunk, many=True).data
+    
+    def _stream(self, sections, synced_at):
+        """Yield the JSON payload one chunk of serialized rows at a time."""
+        encoder = JSONEncoder()
+        yield '{'
+        for name, queryset, render in sections:
+            yield f'{encoder.encode(name)}:['
+            separator = ''
+            for chunk in self._chunks(queryset):
+                data = render(chunk)
+                # Drop the list brackets so chunks join into one array
+                yield separator + encoder.encode(data)[1:-1]
+                separator = ','
+            yield '],'
+        yield f'"synced_at":{encoder.encode(synced_at)}}}'
+    
+    def _chunks(self, queryset):
+        """Yield lists of up to SYNC_CHUNK_SIZE rows (prefetches run per chunk)."""
+        chunk = []
+        for row in queryset.iterator(chunk_size=self.SYNC_CHUNK_SIZE):
+            chunk.append(row)
+            if len(chunk) == self.SYNC_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
 
 
 class CalendarAPIView(APIView):
@@ -217,10 +329,15 @@ class CalendarAPIView(APIView):
     Query params:
     - start_date: ISO datetime string
     - end_date: ISO datetime string
+    
+    Instances are generated lazily and streamed in chunks, so long ranges
+    never hold the whole expansion in memory.
     """
     
     permission_classes = [permissions.IsAuthenticated]
     
+    CALENDAR_CHUNK_SIZE = 500
+    
     def get(self, request):
         """Return tasks for date range."""
         # Parse date parameters
@@ -253,11 +370,49 @@ class CalendarAPIView(APIView):
             include_recurring=True
         )
         
-        return Response({
-            'start_date': start_date.isoformat(),
-            'end_date': end_date.isoformat(),
-            'tasks': task_instances
-        })
+        # Repeat views of a window are served from the cache until any of
+        # the user's tasks changes (see Task.save) or the entry times out
+        cache_key = calendar_cache_key(request.user.id, start_date, end_date)
+        payload = cache.get(cache_key)
+        if payload is not None:
+            return HttpResponse(payload, content_type='application/json')
+        
+        return StreamingHttpResponse(
+            self._cache_stream(cache_key, self._stream(start_date, end_date, task_instances)),
+            content_type='application/json'
+        )
+    
+    @staticmethod
+    def _cache_stream(cache_key, chunks):
+        """Pass chunks through and cache the joined payload if it is small enough."""
+        parts = []
+        size = 0
+        for chunk in chunks:
+            yield chunk
+            if parts is not None:
+                size += len(chunk)
+                parts.append(chunk)
+                if size > CALENDAR_CACHE_MAX_BYTES:
+                    parts = None
+        if parts is not None:
+            cache.set(cache_key, ''.join(parts), timeout=CALENDAR_CACHE_TIMEOUT)
+    
+    def _stream(self, start_date, end_date, task_instances):
+        """Yield the JSON payload, encoding CALENDAR_CHUNK_SIZE instances at a time."""
+        encoder = JSONEncoder()
+        yield (
+            f'{{"start_date":{encoder.encode(start_date.isoformat())},'
+            f'"end_date":{encoder.encode(end_date.isoformat())},"tasks":['
+        )
+        separator = ''
+        while True:
+            chunk = list(islice(task_instances, self.CALENDAR_CHUNK_SIZE))
+            if not chunk:
+                break
+            # Drop the list brackets so chunks join into one array
+            yield separator + encoder.encode(chunk)[1:-1]
+            separator = ','
+        yield ']}'
 
 
 class TaskReorderAPIView(APIView):
@@ -287,7 +442,7 @@ class TaskReorderAPIView(APIView):
             )
         
         try:
-            TaskService.reorder_tasks(task_orders)
+            TaskService.reorder_tasks(task_orders, request.user)
             return Response({'success': True})
         except Exception as e:
             return Response(
@@ -320,7 +475,13 @@ class TaskAttachmentViewSet(viewsets.ModelViewSet):
         ).select_related('task', 'uploaded_by')
     
     def create(self, request, *args, **kwargs):
-        """Handle file upload with task validation."""
+        """
+        Handle file upload with task validation.
+        
+        Several 'file' parts in one request are stored concurrently and
+        inserted with one query (TaskAttachment.objects.bulk_create_with_metadata);
+        a single file goes through the regular serializer save.
+        """
         task_id = request.data.get('task')
         
         if not task_id:
@@ -338,8 +499,28 @@ class TaskAttachmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        files = request.FILES.getlist('file')
+        if len(files) > 1:
+            return self._create_many(task, files)
+        
         return super().create(request, *args, **kwargs)
     
+    def _create_many(self, task, files):
+        """Validate every file first, then store and insert them in bulk."""
+        upload_serializers = [
+            self.get_serializer(data={'task': task.id, 'file': file})
+            for file in files
+        ]
+        for serializer in upload_serializers:
+            serializer.is_valid(raise_exception=True)
+        
+        attachments = TaskAttachment.objects.bulk_create_with_metadata(
+            TaskAttachment(**serializer.with_upload_metadata(dict(serializer.validated_data)))
+            for serializer in upload_serializers
+        )
+        serializer = self.get_serializer(attachments, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
     @action(detail=False, methods=['get'])
     def for_task(self, request):
         """
@@ -0,0 +1,18 @@
+"""
+Cache helpers for Users App.
+
+Usage:
+    from apps.users.cache import google_user_cache_key, GOOGLE_USER_CACHE_TIMEOUT
+    
+    user_id = cache.get(google_user_cache_key(google_id))
+"""
+
+
+# Google account -> user id mappings only change when the link is
+# re-pointed or deleted (see signals.py), so they can be kept a while
+GOOGLE_USER_CACHE_TIMEOUT = 60 * 60
+
+
+def google_user_cache_key(google_id):
+    """Cache key mapping a Google account uid to the linked user's id."""
+    return f"google_user_{google_id}"
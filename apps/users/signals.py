@@ -0,0 +1,23 @@
+"""
+Signal handlers for Users App.
+"""
+
+from allauth.socialaccount.models import SocialAccount
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import google_user_cache_key
+
+
+@receiver(post_save, sender=SocialAccount)
+@receiver(post_delete, sender=SocialAccount)
+def forget_google_user(sender, instance, **kwargs):
+    """
+    Drop the cached uid -> user id mapping when a Google link changes.
+    
+    Deleting a user cascades to its social accounts, so this also
+    covers deleted users.
+    """
+    if instance.provider == 'google':
+        cache.delete(google_user_cache_key(instance.uid))
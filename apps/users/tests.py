@@ -5,6 +5,8 @@ Tests for Users app.
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
+from .views import get_free_username
+
 User = get_user_model()
 
 
@@ -26,4 +28,37 @@ class UserModelTest(TestCase):
     def test_user_str(self):
         """Test user string representation."""
         user = User.objects.create_user(username='testuser')
-        self.assertEqual(str(user), 'testuser')
\ No newline at end of file
+        self.assertEqual(str(user), 'testuser')
+
+
+class GetFreeUsernameTest(TestCase):
+    """Test picking a username for new Google users."""
+
+    def take(self, *usernames):
+        for username in usernames:
+            User.objects.create_user(username=username)
+
+    def test_base_free(self):
+        """Test the base itself is used when free."""
+        self.assertEqual(get_free_username('jane'), 'jane')
+
+    def test_next_suffix(self):
+        """Test the first free numeric suffix is used."""
+        self.take('jane', 'jane1', 'jane2')
+        self.assertEqual(get_free_username('jane'), 'jane3')
+
+    def test_fills_gaps(self):
+        """Test a free suffix below a taken one is reused."""
+        self.take('jane', 'jane2')
+        self.assertEqual(get_free_username('jane'), 'jane1')
+
+    def test_ignores_other_names_with_prefix(self):
+        """Test usernames that merely share the prefix do not collide."""
+        self.take('janet', 'jane_doe', 'jane1x')
+        self.assertEqual(get_free_username('jane'), 'jane')
+
+    def test_regex_characters_in_base(self):
+        """Test the base is matched literally."""
+        self.take('janexdoe', 'jane.doe')
+        self.assertEqual(get_free_username('jane.doe'), 'jane.doe1')
+
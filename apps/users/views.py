@@ -1,23 +1,63 @@
 """
 User authentication views.
 """
+import re
+from functools import lru_cache
+from urllib.parse import quote, urlencode
+
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.shortcuts import redirect
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client, OAuth2Error
 from allauth.socialaccount.models import SocialLogin, SocialAccount
 from allauth.socialaccount.helpers import complete_social_login
+import jwt
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from .cache import GOOGLE_USER_CACHE_TIMEOUT, google_user_cache_key
 from .serializers import UserSerializer, RegisterSerializer
 
 User = get_user_model()
 
+# Google OAuth app credentials; settings are fixed for the process lifetime
+_GOOGLE_APP = settings.SOCIALACCOUNT_PROVIDERS.get('google', {}).get('APP', {})
+_GOOGLE_CLIENT_ID = _GOOGLE_APP.get('client_id')
+_GOOGLE_CLIENT_SECRET = _GOOGLE_APP.get('secret')
+
+_GOOGLE_AUTH_BASE = 'https://accounts.google.com/o/oauth2/v2/auth?'
+
+# (connect, read) seconds for calls to Google's OAuth endpoints
+GOOGLE_HTTP_TIMEOUT = (3.05, 10)
+
+# One retry on gateway errors and failed connects. Read timeouts are not
+# retried: Google may already have redeemed the authorization code
+GOOGLE_HTTP_RETRY = Retry(
+    total=1,
+    read=0,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({'GET', 'POST'}),
+    raise_on_status=False,
+)
+
+# Shared across callbacks so pooled keep-alive connections skip the
+# TCP/TLS handshake to googleapis.com on every login
+_GOOGLE_SESSION = requests.Session()
+_GOOGLE_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=GOOGLE_HTTP_RETRY,
+))
+
 
 def get_tokens_for_user(user):
     """Generate JWT tokens for a user."""
@@ -28,6 +68,70 @@ def get_tokens_for_user(user):
     }
 
 
+def get_google_id_token_claims(token_data, client_id):
+    """
+    Read the user's profile from the id_token in a Google token response.
+    
+    The token comes straight from Google's token endpoint over TLS, so
+    per OpenID Connect Core 3.1.3.7 its signature need not be checked;
+    the audience still must be our client. This saves the userinfo
+    round-trip on every login.
+    
+    Returns:
+        Dict shaped like the userinfo response ('id', 'email', 'name', ...),
+        or None if there is no usable id_token
+    """
+    id_token = token_data.get('id_token')
+    if not id_token:
+        return None
+    
+    claims = jwt.decode(id_token, options={'verify_signature': False})
+    if claims.get('aud') != client_id or not claims.get('sub'):
+        return None
+    return {**claims, 'id': claims['sub']}
+
+
+@lru_cache(maxsize=8)
+def get_google_auth_url(redirect_uri):
+    """
+    Google OAuth consent URL for redirect_uri.
+    
+    Only redirect_uri varies (one per host the API is served from), so
+    the encoded URL is built once per value.
+    """
+    query = urlencode(
+        {
+            'client_id': _GOOGLE_CLIENT_ID,
+            'redirect_uri': redirect_uri,
+            'response_type': 'code',
+            'scope': 'openid email profile',
+            'access_type': 'online',
+        },
+        quote_via=quote
+    )
+    return _GOOGLE_AUTH_BASE + query
+
+
+def get_free_username(base_username):
+    """
+    First of base_username, base_username1, base_username2, ... not taken.
+    
+    One query fetches every possible collision at once; the regex only
+    matches the base followed by digits, so unrelated usernames sharing
+    the prefix are not loaded.
+    """
+    taken = set(
+        User.objects.filter(username__regex=rf'^{re.escape(base_username)}\d*$')
+        .values_list('username', flat=True)
+    )
+    username = base_username
+    counter = 1
+    while username in taken:
+        username = f"{base_username}{counter}"
+        counter += 1
+    return username
+
+
 class RegisterView(generics.CreateAPIView):
     """
     User registration endpoint.
@@ -74,9 +178,7 @@ class GoogleLoginView(APIView):
     permission_classes = [permissions.AllowAny]
     
     def get(self, request):
-        google_config = settings.SOCIALACCOUNT_PROVIDERS.get('google', {})
-        app_config = google_config.get('APP', {})
-        client_id = app_config.get('client_id')
+        client_id = _GOOGLE_CLIENT_ID
         
         if not client_id:
             return Response(
@@ -88,14 +190,7 @@ class GoogleLoginView(APIView):
         redirect_uri = request.build_absolute_uri('/api/auth/google/callback/')
         
         # Build Google OAuth URL
-        google_auth_url = (
-            f"https://accounts.google.com/o/oauth2/v2/auth?"
-            f"client_id={client_id}&"
-            f"redirect_uri={redirect_uri}&"
-            f"response_type=code&"
-            f"scope=openid%20email%20profile&"
-            f"access_type=online"
-        )
+        google_auth_url = get_google_auth_url(redirect_uri)
         
         return Response({
             'auth_url': google_auth_url,
@@ -128,16 +223,13 @@ class GoogleLoginCallbackView(APIView):
             )
         
         try:
-            # Get Google OAuth config
-            google_config = settings.SOCIALACCOUNT_PROVIDERS.get('google', {})
-            app_config = google_config.get('APP', {})
-            client_id = app_config.get('client_id')
-            client_secret = app_config.get('secret')
+            client_id = _GOOGLE_CLIENT_ID
+            client_secret = _GOOGLE_CLIENT_SECRET
             
             redirect_uri = request.build_absolute_uri('/api/auth/google/callback/')
             
             # Exchange code for tokens
-            token_response = requests.post(
+            token_response = _GOOGLE_SESSION.post(
                 'https://oauth2.googleapis.com/token',
                 data={
                     'code': code,
@@ -145,7 +237,8 @@ class GoogleLoginCallbackView(APIView):
                     'client_secret': client_secret,
                     'redirect_uri': redirect_uri,
                     'grant_type': 'authorization_code',
-                }
+                },
+                timeout=GOOGLE_HTTP_TIMEOUT
             )
             
             if token_response.status_code != 200:
@@ -155,57 +248,81 @@ class GoogleLoginCallbackView(APIView):
             token_data = token_response.json()
             access_token = token_data.get('access_token')
             
-            # Get user info from Google
-            userinfo_response = requests.get(
-                'https://www.googleapis.com/oauth2/v2/userinfo',
-                headers={'Authorization': f'Bearer {access_token}'}
-            )
-            
-            if userinfo_response.status_code != 200:
-                frontend_url = settings.LOGOUT_REDIRECT_URL
-                return redirect(f"{frontend_url}?error=userinfo_failed")
+            # The openid scope returns the profile in the id_token; only
+            # fall back to the userinfo endpoint without one
+            userinfo = get_google_id_token_claims(token_data, client_id)
+            if userinfo is None:
+                userinfo_response = _GOOGLE_SESSION.get(
+                    'https://www.googleapis.com/oauth2/v2/userinfo',
+                    headers={'Authorization': f'Bearer {access_token}'},
+                    timeout=GOOGLE_HTTP_TIMEOUT
+                )
+                
+                if userinfo_response.status_code != 200:
+                    frontend_url = settings.LOGOUT_REDIRECT_URL
+                    return redirect(f"{frontend_url}?error=userinfo_failed")
+                
+                userinfo = userinfo_response.json()
             
-            userinfo = userinfo_response.json()
             email = userinfo.get('email')
             google_id = userinfo.get('id')
-            name = userinfo.get('name', '')
+            name_parts = (userinfo.get('name') or '').split()
             
-            # Find or create user
-            try:
-                # Check if social account exists
-                social_account = SocialAccount.objects.get(
-                    provider='google',
-                    uid=google_id
-                )
-                user = social_account.user
-            except SocialAccount.DoesNotExist:
-                # Check if user with this email exists
-                try:
-                    user = User.objects.get(email=email)
-                except User.DoesNotExist:
-                    # Create new user
-                    username = email.split('@')[0]
-                    # Ensure unique username
-                    base_username = username
-                    counter = 1
-                    while User.objects.filter(username=username).exists():
-                        username = f"{base_username}{counter}"
-                        counter += 1
-                    
-                    user = User.objects.create_user(
-                        username=username,
-                        email=email,
-                        first_name=name.split()[0] if name else '',
-                        last_name=' '.join(name.split()[1:]) if name and len(name.split()) > 1 else ''
-                    )
+            # Returning users: the JWT only needs the user id and active
+            # flag, so a cached mapping skips the social account lookup
+            user = None
+            user_id = cache.get(google_user_cache_key(google_id))
+            if user_id is not None:
+                user = User.objects.only('id', 'is_active').filter(pk=user_id).first()
+            if user is None:
+                # Find or create user; the new user and its Google link are
+                # committed together
+                with transaction.atomic():
+                    try:
+                        # Check if social account exists
+                        social_account = SocialAccount.objects.select_related('user').get(
+                            provider='google',
+                            uid=google_id
+                        )
+                        user = social_account.user
+                    except SocialAccount.DoesNotExist:
+                        # Check if user with this email exists
+                        try:
+                            user = User.objects.get(email=email)
+                        except User.DoesNotExist:
+                            # Create new user
+                            base_username = email.split('@')[0]
+                            for attempt in range(2):
+                                try:
+                                    # Savepoint, so a lost race can be retried
+                                    with transaction.atomic():
+                                        user = User.objects.create_user(
+                                            username=get_free_username(base_username),
+                                            email=email,
+                                            first_name=name_parts[0] if name_parts else '',
+                                            last_name=' '.join(name_parts[1:])
+                                        )
+                                    break
+                                except IntegrityError:
+                                    # Another signup took the username in between
+                                    if attempt:
+                                        raise
+                        
+                        # Create social account link; a concurrent callback for
+                        # the same Google account may have linked it first
+                        social_account, _ = SocialAccount.objects.get_or_create(
+                            provider='google',
+                            uid=google_id,
+                            defaults={'user': user, 'extra_data': userinfo}
+                        )
+                        user = social_account.user
                 
-                # Create social account link
-                SocialAccount.objects.create(
-                    user=user,
-                    provider='google',
-                    uid=google_id,
-                    extra_data=userinfo
-                )
+                if user.is_active:
+                    cache.set(google_user_cache_key(google_id), user.pk, GOOGLE_USER_CACHE_TIMEOUT)
+            
+            if not user.is_active:
+                frontend_url = settings.LOGOUT_REDIRECT_URL
+                return redirect(f"{frontend_url}?error=account_disabled")
             
             # Generate JWT tokens
             tokens = get_tokens_for_user(user)
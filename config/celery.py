@@ -9,6 +9,9 @@ Usage:
     # Start worker
     celery -A config worker -l INFO
     
+    # Start media worker (evidence image/video processing)
+    celery -A config worker -Q media -l INFO
+    
     # Start beat scheduler (for periodic tasks)
     celery -A config beat -l INFO
     
@@ -288,6 +288,13 @@ CELERY_ENABLE_UTC = True
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes max
 
+# CPU-bound evidence processing gets its own queue so it can run on a
+# worker sized to the machine's cores:
+#   celery -A config worker -Q media --concurrency=<cores>
+CELERY_TASK_ROUTES = {
+    'apps.commitments.tasks.process_evidence_file': {'queue': 'media'},
+}
+
 # Celery Beat Schedule (Periodic Tasks)
 from celery.schedules import crontab
 
@@ -302,6 +309,16 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.commitments.tasks.send_deadline_reminders',
         'schedule': crontab(minute='*/15'),  # Every 15 minutes
     },
+    # Keep materialized recurring task occurrences ahead of the calendar
+    'refresh-recurrence-occurrences': {
+        'task': 'apps.tasks.tasks.refresh_recurrence_occurrences',
+        'schedule': crontab(hour=3, minute=30),  # Daily at 03:30
+    },
+    # Snapshot habit streaks through the day that just ended
+    'refresh-habit-streaks': {
+        'task': 'apps.tasks.tasks.refresh_habit_streaks',
+        'schedule': crontab(hour=0, minute=5),  # Daily at 00:05
+    },
 }
 
 # =============================================================================
@@ -377,3 +394,15 @@ ALLOWED_ATTACHMENT_EXTENSIONS = [
 # Maximum file size for attachments (in bytes)
 MAX_ATTACHMENT_SIZE = 10 * 1024 * 1024  # 10 MB
 
+# How long a generated attachment URL is reused (seconds); keep below the
+# storage's signed URL expiry (1 hour for S3 by default)
+ATTACHMENT_URL_CACHE_TTL = 50 * 60  # 50 minutes
+
+# =============================================================================
+# TASK API
+# =============================================================================
+
+# Default layout of GET /tasks/tree/ ('nested' for legacy clients, or 'flat':
+# a path-ordered node list with parent ids that the client nests itself).
+# Clients can pick one per request with ?layout=
+TASK_TREE_LAYOUT = config('TASK_TREE_LAYOUT', default='nested')